@@ -3,8 +3,12 @@ Advent of Code 2015
 Day 9: All in a Single Night
 https://adventofcode.com/2015/day/9
 """
+import sys
 from collections import defaultdict
-from sys import maxsize
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tours import held_karp
 
 
 def read_input_file():
@@ -16,36 +20,25 @@ def read_input_file():
     return distances
 
 
-def routes_dfs(start, graph):
-    longest, shortest, visited = 0, maxsize, set()
-
-    def dfs(place, distance):
-        nonlocal longest, shortest, visited
-        visited.add(place)
-        if len(visited) == len(graph):
-            if distance < shortest:
-                shortest = distance
-            if distance > longest:
-                longest = distance
-        else:
-            for destination, leg_distance in graph[place]:
-                if destination not in visited:
-                    dfs(destination, distance + leg_distance)
-        visited.remove(place)
-
-    dfs(start, 0)
-    return shortest, longest
-
-
 def shortest_and_longest_distances(cities):
-    shortest_distance, longest_distance = maxsize, 0
-    for city in cities:
-        a, b = routes_dfs(city, cities)
-        if a < shortest_distance:
-            shortest_distance = a
-        if b > longest_distance:
-            longest_distance = b
-    return shortest_distance, longest_distance
+    names = sorted(cities)
+    index = {city: i for i, city in enumerate(names)}
+    # Unconnected pairs of cities are left as impossible legs
+    legs = [[0 if a == b else None for b in names] for a in names]
+    for origin, destinations in cities.items():
+        for destination, distance in destinations:
+            legs[index[origin]][index[destination]] = distance
+
+    impossible = sum(distance for destinations in cities.values() for _, distance in destinations) + 1
+
+    def with_depot(missing):
+        # Node 0 is a depot no distance from every city, so the route may start anywhere
+        return [[0] * (len(names) + 1)] + [[0] + [missing if leg is None else leg for leg in row]
+                                           for row in legs]
+
+    shortest = held_karp(with_depot(impossible))
+    longest = held_karp(with_depot(-impossible), maximize=True)
+    return shortest, longest
 
 
 if __name__ == "__main__":
@@ -3,25 +3,118 @@ Advent of Code 2015
 Day 10: Elves Look, Elves Say
 https://adventofcode.com/2015/day/10
 """
+from collections import Counter
+
+# Steps a split must survive before it is trusted. Every boundary between
+# Conway's 92 elements already holds after 8 steps.
+SPLIT_HORIZON = 16
+# Digits after a boundary followed at first when checking it
+BOUNDARY_WINDOW = 32
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip()
 
 
+def look_and_say(digits):
+    """One step of the sequence on a bytes string, run by run."""
+    result = bytearray()
+    index, size = 0, len(digits)
+    while index < size:
+        digit = digits[index]
+        next_index = index + 1
+        while next_index < size and digits[next_index] == digit:
+            next_index += 1
+        result += b"%d" % (next_index - index)
+        result.append(digit)
+        index = next_index
+    return bytes(result)
+
+
+def boundary_holds(last_digit, right, window):
+    """
+    Whether a string ending in `last_digit` and `right` evolve independently.
+
+    The last digit of a string never changes, so the two halves only merge
+    when the first digit of `right` catches up with it. Only that digit
+    matters, so `right` need only be the first `window` digits of the
+    string that follows, and is cut back to that many after every step. A
+    cut string's last run may go on past the cut, so the pair it says is
+    dropped, and None is returned if nothing certain is left before the
+    horizon.
+    """
+    complete = len(right) < window
+    for _ in range(SPLIT_HORIZON):
+        if not right:
+            return None
+        if right[0] == last_digit:
+            return False
+        right = look_and_say(right)
+        if not complete:
+            right = right[:-2]
+        if len(right) > window:
+            right, complete = right[:window], False
+    return None if not right else right[0] != last_digit
+
+
+def split_elements(digits):
+    """
+    Split a string that is at least two steps old into Conway's elements.
+
+    Only the next BOUNDARY_WINDOW digits are followed to check a boundary,
+    and twice as many when that is not enough, so splitting stays linear in
+    the length of the string.
+    """
+    elements = []
+    start = 0
+    for index in range(1, len(digits)):
+        if digits[index - 1] == digits[index]:
+            continue
+        width = BOUNDARY_WINDOW
+        while (holds := boundary_holds(digits[index - 1], digits[index:index + width], width)) is None:
+            width *= 2
+        if holds:
+            elements.append(digits[start:index])
+            start = index
+    elements.append(digits[start:])
+    return elements
+
+
+def decay_table(elements):
+    """Counts of the elements each element decays into, for all reachable elements."""
+    table = {}
+    pending = list(elements)
+    while pending:
+        element = pending.pop()
+        if element not in table:
+            table[element] = Counter(split_elements(look_and_say(element)))
+            pending.extend(table[element])
+    return table
+
+
 def process_string(number_str, times=40):
-    for _ in range(times):
-        sequence = []
-        index = 0
-        while index < len(number_str):
-            next_index = index + 1
-            while next_index < len(number_str) and number_str[next_index] == number_str[index]:
-                next_index += 1
-            sequence.append(str(next_index - index))
-            sequence.append(number_str[index])
-            index = next_index
-        number_str = "".join(sequence)
-    return len(number_str)
+    """
+    Length of the sequence after `times` steps, without building it.
+
+    After two steps (done on the digits, as any seed may still hold long runs
+    or big digits) the string splits into elements that decay independently,
+    so only how many of each element there are needs to be followed.
+    """
+    digits = number_str.encode()
+    for _ in range(min(times, 2)):
+        digits = look_and_say(digits)
+    if times <= 2 or not digits:
+        return len(digits)
+
+    counts = Counter(split_elements(digits))
+    table = decay_table(counts)
+    for _ in range(times - 2):
+        next_counts = Counter()
+        for element, count in counts.items():
+            for product, multiplicity in table[element].items():
+                next_counts[product] += count * multiplicity
+        counts = next_counts
+    return sum(len(element) * count for element, count in counts.items())
 
 
 def part_one(number_string):
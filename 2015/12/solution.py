@@ -3,36 +3,86 @@ Advent of Code 2015
 Day 12: JSAbacusFramework.io
 https://adventofcode.com/2015/day/12
 """
-from json import loads as load_json_string
-from re import findall
+from itertools import chain
+from re import compile as compile_regex
+
+TOKEN = compile_regex(rb'\s*(?:("(?:[^"\\]|\\.)*")|(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)|([{}\[\]:,]|true|false|null))')
+RED = b'"red"'
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip()
 
 
-def part_one(text):
-    return sum(list(map(int, findall(r"-?\d+", text))))
+def read_chunks(file_path, chunk_size=1 << 20):
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def sum_numbers(chunks, ignore_red=False):
+    """
+    Sum of the numbers in a JSON document, scanning its tokens once.
+
+    Every open object or array has a frame [sum, is object, holds "red"] on a
+    stack; a closed container adds its sum to the one around it, unless it is
+    an object with a "red" value and `ignore_red` is set. Only the innermost
+    unfinished token is kept between chunks, so memory depends on nesting
+    depth, not on the size of the document.
+    """
+    total = 0
+    stack = []
+    after_colon = False
+    buffer = b""
 
+    for chunk in chain(chunks, [None]):
+        final = chunk is None
+        buffer += b"" if final else chunk
+        position, size = 0, len(buffer)
+        while position < size:
+            match = TOKEN.match(buffer, position)
+            # A token touching the end of the chunk may continue in the next one
+            if not final and (match is None or match.end() == size):
+                break
+            if match is None:
+                if buffer[position:].isspace():
+                    position = size
+                    break
+                raise ValueError(f"invalid JSON near {buffer[position:position + 20]!r}")
+            position = match.end()
+            string, number, symbol = match.groups()
 
-def filtered_out_red(elem):
-    numbers = []
-    if isinstance(elem, int):
-        numbers.append(elem)
-    elif isinstance(elem, list):
-        for item in elem:
-            numbers.extend(filtered_out_red(item))
-    elif isinstance(elem, dict):
-        # Ignore any object (and all of its children) which has any property with the value "red"
-        if "red" not in elem.values():
-            for item in elem.values():
-                numbers.extend(filtered_out_red(item))
-    return numbers
+            if number is not None:
+                if number.lstrip(b"-").isdigit():
+                    if stack:
+                        stack[-1][0] += int(number)
+                    else:
+                        total += int(number)
+            elif string is not None:
+                if after_colon and string == RED and stack and stack[-1][1]:
+                    stack[-1][2] = True
+            elif symbol in (b"{", b"["):
+                stack.append([0, symbol == b"{", False])
+            elif symbol in (b"}", b"]"):
+                frame_sum, is_object, has_red = stack.pop()
+                if not (ignore_red and is_object and has_red):
+                    if stack:
+                        stack[-1][0] += frame_sum
+                    else:
+                        total += frame_sum
+            after_colon = symbol == b":"
+
+        buffer = buffer[position:]
+
+    return total
+
+
+def part_one(text):
+    return sum_numbers([text.encode()])
 
 
 def part_two(text):
-    input_json = load_json_string(text)
-    return sum(filtered_out_red(input_json))
+    return sum_numbers([text.encode()], ignore_red=True)
 
 
 if __name__ == "__main__":
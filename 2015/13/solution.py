@@ -3,8 +3,12 @@ Advent of Code 2015
 Day 13: Knights of the Dinner Table
 https://adventofcode.com/2015/day/13
 """
+import sys
 from collections import defaultdict
-from itertools import permutations
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tours import held_karp
 
 
 def read_input_file():
@@ -22,17 +26,12 @@ def read_input_file():
 
 
 def part_one(happiness_units):
-    best_happiness = 0
-    num_seats = len(happiness_units)
-    for arrangement in permutations(happiness_units.keys()):
-        arrangement_score = 0
-        for i in range(num_seats):
-            next_seat = (i + 1) % num_seats
-            arrangement_score += happiness_units[arrangement[i]][arrangement[next_seat]]
-            arrangement_score += happiness_units[arrangement[next_seat]][arrangement[i]]
-        if arrangement_score > best_happiness:
-            best_happiness = arrangement_score
-    return best_happiness
+    guests = list(happiness_units)
+    # Sitting next to each other changes both guests' happiness
+    pair_happiness = [[happiness_units[a].get(b, 0) + happiness_units[b].get(a, 0) if a != b else 0
+                       for b in guests] for a in guests]
+    # The table is a cycle, so every seating can start at guest 0
+    return held_karp(pair_happiness, cycle=True, maximize=True)
 
 
 def part_two(happiness_units):
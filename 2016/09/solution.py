@@ -3,33 +3,89 @@ Advent of Code 2016
 Day 9: Explosives in Cyberspace
 https://adventofcode.com/2016/day/9
 """
-from re import search as regex_search
+WHITESPACE = b" \t\r\n"
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip()
 
 
+def read_chunks(file_path, chunk_size=1 << 20):
+    """Yield a file's bytes in chunks, with whitespace removed as the format requires."""
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk.translate(None, WHITESPACE)
+
+
+def decompressed_length(chunks, recursive=True):
+    """
+    Length of the decompressed data, in one left-to-right pass over the input.
+
+    Nothing is decompressed. Every literal character counts as many times as
+    the product of the repeats of the markers whose spans it lies in. Those
+    markers are kept on a stack of (end position, weight), so nesting depth
+    costs neither recursion nor copies. Without `recursive` (format version
+    one) a marker's span is counted as plain text and skipped.
+
+    The input can arrive in any number of chunks, even splitting a marker.
+    Only an unfinished marker is carried over to the next chunk.
+    """
+    total = 0
+    spans = []  # (absolute end, weight), innermost last
+    skip_to = skip_repeats = 0
+    buffer = bytearray()
+    base = 0  # Absolute position of buffer[0]
+
+    for chunk in chunks:
+        buffer += chunk
+        size = len(buffer)
+        i = 0
+        while i < size:
+            position = base + i
+            if skip_to > position:
+                i = min(size, skip_to - base)
+                continue
+            while spans and spans[-1][0] <= position:
+                spans.pop()
+            weight = spans[-1][1] if spans else 1
+            limit = min(size, spans[-1][0] - base) if spans else size
+
+            marker_start = buffer.find(b"(", i, limit)
+            if marker_start < 0:
+                total += (limit - i) * weight
+                i = limit
+                continue
+            total += (marker_start - i) * weight
+            marker_end = buffer.find(b")", marker_start)
+            if marker_end < 0:
+                i = marker_start  # Wait for the rest of the marker
+                break
+
+            length, repeats = map(int, buffer[marker_start + 1:marker_end].split(b"x"))
+            i = marker_end + 1
+            if recursive:
+                spans.append((base + i + length, weight * repeats))
+            else:
+                total += length * repeats
+                skip_to, skip_repeats = base + i + length, repeats
+
+        del buffer[:i]
+        base += i
+
+    end = base + len(buffer)
+    # A span running past the end only repeats what is there
+    if skip_to > end:
+        total -= (skip_to - end) * skip_repeats
+    # An unfinished marker at the very end is just text
+    return total + len(buffer)
+
+
 def part_one(text):
-    position = 0
-    while (left_index := text.find("(", position)) > -1:
-        right_index = text.find(")", left_index)
-        sequence_length, repeats = tuple(map(int, text[left_index+1:right_index].split("x")))
-        sequence = text[right_index+1:right_index+1+sequence_length]
-        text = text[:left_index] + (sequence * repeats) + text[right_index+1+sequence_length:]
-        position = left_index + len(sequence) * repeats
-    return len(text)
+    return decompressed_length([text.encode()], recursive=False)
 
 
 def part_two(text):
-    marker = regex_search(r"\((\d+)x(\d+)\)", text)
-    if not marker:
-        return len(text)
-    position = marker.start(0)
-    size = int(marker.group(1))
-    repeats = int(marker.group(2))
-    index = position + len(marker.group())
-    return len(text[:position]) + part_two(text[index:index+size]) * repeats + part_two(text[index+size:])
+    return decompressed_length([text.encode()], recursive=True)
 
 
 if __name__ == "__main__":
@@ -3,39 +3,81 @@ Advent of Code 2016
 Day 16: Dragon Checksum
 https://adventofcode.com/2016/day/16
 """
+from itertools import accumulate
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip()
 
 
-def dragon_curve(binary_string):
-    b = "".join("0" if c == "1" else "1" for c in reversed(binary_string))
-    return "{}0{}".format(binary_string, b)
+def joiner_ones(count):
+    """
+    Number of 1s among the first `count` joiner bits of the dragon fill.
 
+    The joiners form the regular paperfolding sequence: joiner k - 1 is 1
+    exactly when the odd part of k is 3 modulo 4. For every power of two the
+    k <= count with that odd part are counted directly.
+    """
+    total = 0
+    while count:
+        total += (count + 1) // 4
+        count >>= 1
+    return total
 
-def binary_checksum(binary_string):
-    checksum_bits = []
-    for a, b in zip(binary_string[::2], binary_string[1::2]):
-        checksum_bits.append("1" if a == b else "0")
-    if len(checksum_bits) % 2 != 0:
-        return "".join(checksum_bits)
-    else:
-        return binary_checksum("".join(checksum_bits))
 
+class DragonFill:
+    """
+    The disk filled from `data`, with any prefix's count of 1s in O(log n).
 
-def generate_binary_string(binary_str, length):
-    while len(binary_str) < length:
-        binary_str = dragon_curve(binary_str)
-    return binary_str[:length]
+    The fill is the data a, then its reversed complement b, alternating, with
+    one joiner bit after each: a j0 b j1 a j2 b j3 ...
+    """
+
+    def __init__(self, data):
+        self.size = len(data)
+        # prefix[i] is the number of 1s in data[:i]
+        self.prefix = list(accumulate((bit == "1" for bit in data), initial=0))
+
+    def ones_before(self, position):
+        """Number of 1s in the first `position` bits of the fill."""
+        n, prefix = self.size, self.prefix
+        segment, offset = divmod(position, n + 1)
+        ones_a = prefix[n]
+        total = (segment + 1) // 2 * ones_a + segment // 2 * (n - ones_a) + joiner_ones(segment)
+        if segment % 2 == 0:
+            total += prefix[offset]
+        else:
+            # b[:offset] is the complement of the last `offset` bits of a
+            total += offset - (ones_a - prefix[n - offset])
+        return total
+
+
+def checksum_bits(data, length):
+    """
+    Stream the checksum of the first `length` bits of the fill, one bit at a time.
+
+    Folding pairs until the length is odd turns each block of 2^t bits into a
+    single bit, which is 1 exactly when the block holds an even number of 1s.
+    """
+    fill = DragonFill(data)
+    block = length & -length  # Largest power of two dividing the length
+    previous = 0
+    for end in range(block, length + 1, block):
+        ones = fill.ones_before(end)
+        yield "1" if (ones - previous) % 2 == 0 else "0"
+        previous = ones
+
+
+def binary_checksum(data, length):
+    return "".join(checksum_bits(data, length))
 
 
 def part_one(data):
-    return binary_checksum(generate_binary_string(data, 272))
+    return binary_checksum(data, 272)
 
 
 def part_two(data):
-    return binary_checksum(generate_binary_string(data, 35651584))
+    return binary_checksum(data, 35651584)
 
 
 if __name__ == "__main__":
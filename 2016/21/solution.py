@@ -3,7 +3,7 @@ Advent of Code 2016
 Day 21: Scrambled Letters and Hash
 https://adventofcode.com/2016/day/21
 """
-from itertools import permutations
+import numpy as np
 
 
 def read_input_file():
@@ -25,74 +25,129 @@ def read_input_file():
     return instructions
 
 
-def move_position(s, a, b):
-    char_list = list(s)
-    c = char_list.pop(a)
-    char_list.insert(b, c)
-    return "".join(char_list)
+def compile_instructions(instructions, length):
+    """
+    Turn the instructions into operations on index lists, for one password length.
 
+    Anything that only depends on positions becomes a permutation `order`
+    (scrambled[i] = password[order[i]]), and runs of them are fused into one.
+    The two letter-driven operations stay as they are: swapping letters, and
+    rotating based on a letter, which looks up a right rotation for the
+    letter's index and the exact reverse rotation for where the letter ends up.
+    """
+    operations = []
 
-def rotate_position(s, letter):
-    index = s.index(letter)
-    if 3 < index:
-        index += 1
-    index += 1
-    for i in range(index):
-        s = s[-1] + s[:-1]
-    return s
+    def add_permutation(order):
+        if operations and operations[-1][0] == "permute":
+            previous = operations[-1][1]
+            order = [previous[i] for i in order]
+            operations.pop()
+        operations.append(("permute", order))
 
+    def rotation(steps):
+        return [(i - steps) % length for i in range(length)]
 
-def rotate_left(s, rotations):
-    for _ in range(int(rotations)):
-        s = s[1:] + s[0]
-    return s
-
-
-def rotate_right(s, rotations):
-    for _ in range(int(rotations)):
-        s = s[-1] + s[:-1]
-    return s
-
-
-def reverse_positions(s, a, b):
-    char_list = list(s)
-    char_list[a:b + 1] = reversed(char_list[a:b + 1])
-    return "".join(char_list)
-
-
-def swap_letters(s, a, b):
-    char_list = list(s)
-    if isinstance(a, str):
-        a, b = char_list.index(a), char_list.index(b)
-    char_list[b], char_list[a] = char_list[a], char_list[b]
-    return "".join(char_list)
+    for instruction in instructions:
+        match instruction:
+            case ("swap", int(a), int(b)):
+                order = list(range(length))
+                order[a], order[b] = b, a
+                add_permutation(order)
+            case ("swap", a, b):
+                operations.append(("swap", a, b))
+            case ("move", a, b):
+                order = list(range(length))
+                order.insert(b, order.pop(a))
+                add_permutation(order)
+            case ("reverse", a, b):
+                order = list(range(length))
+                order[a:b + 1] = reversed(order[a:b + 1])
+                add_permutation(order)
+            case ("rotate", "left", steps):
+                add_permutation(rotation(-int(steps)))
+            case ("rotate", "right", steps):
+                add_permutation(rotation(int(steps)))
+            case ("rotate", _, letter):
+                shifts = [(1 + index + (index > 3)) % length for index in range(length)]
+                targets = [(index + shift) % length for index, shift in enumerate(shifts)]
+                # Only undoable when no two indexes end up in the same place
+                unshifts = None
+                if len(set(targets)) == length:
+                    unshifts = [0] * length
+                    for target, shift in zip(targets, shifts):
+                        unshifts[target] = -shift % length
+                operations.append(("rotate", letter, shifts, unshifts))
+
+    return operations
+
+
+def invert_permutation(order):
+    inverse = [0] * len(order)
+    for i, j in enumerate(order):
+        inverse[j] = i
+    return inverse
+
+
+def rotation_table(operation, reverse):
+    _, letter, shifts, unshifts = operation
+    if not reverse:
+        return shifts
+    if unshifts is None:
+        raise ValueError(f"rotating based on {letter} cannot be undone for this length")
+    return unshifts
+
+
+def scramble(operations, password, reverse=False):
+    """Scramble a password, or with `reverse` unscramble it in one backward pass."""
+    letters = list(password)
+    for operation in reversed(operations) if reverse else operations:
+        match operation:
+            case ("permute", order):
+                if reverse:
+                    order = invert_permutation(order)
+                letters = [letters[i] for i in order]
+            case ("swap", a, b):
+                i, j = letters.index(a), letters.index(b)
+                letters[i], letters[j] = b, a
+            case ("rotate", letter, _, _):
+                steps = rotation_table(operation, reverse)[letters.index(letter)]
+                letters = letters[-steps:] + letters[:-steps] if steps else letters
+    return "".join(letters)
+
+
+def scramble_batch(operations, passwords, reverse=False):
+    """
+    Scramble (or unscramble) many passwords of the same length at once.
+
+    `passwords` is an array of shape (count, length) holding one letter code
+    per byte, e.g. np.frombuffer(b"".join(words), np.uint8).reshape(-1, length).
+    """
+    letters = np.array(passwords, dtype=np.uint8)
+    rows = np.arange(len(letters))[:, None]
+    columns = np.arange(letters.shape[1])
+    for operation in reversed(operations) if reverse else operations:
+        match operation:
+            case ("permute", order):
+                if reverse:
+                    order = invert_permutation(order)
+                letters = letters[:, order]
+            case ("swap", a, b):
+                is_a, is_b = letters == ord(a), letters == ord(b)
+                letters[is_a], letters[is_b] = ord(b), ord(a)
+            case ("rotate", letter, _, _):
+                index = np.argmax(letters == ord(letter), axis=1)
+                steps = np.array(rotation_table(operation, reverse))[index]
+                letters = letters[rows, (columns - steps[:, None]) % letters.shape[1]]
+    return letters
 
 
 def part_one(instructions, password):
-    for instruction in instructions:
-        match instruction[0]:
-            case "move":
-                password = move_position(password, instruction[1], instruction[2])
-            case "reverse":
-                password = reverse_positions(password, instruction[1], instruction[2])
-            case "rotate":
-                if instruction[1] == "left":
-                    password = rotate_left(password, instruction[-1])
-                elif instruction[1] == "right":
-                    password = rotate_right(password, instruction[-1])
-                else:
-                    password = rotate_position(password, instruction[-1])
-            case "swap":
-                password = swap_letters(password, instruction[1], instruction[2])
-
-    return password
+    return scramble(compile_instructions(instructions, len(password)), password)
 
 
 def part_two(instructions, expected_password):
-    for candidate in permutations(expected_password, len(expected_password)):
-        password = part_one(instructions, "".join(candidate))
-        if expected_password == password:
-            return "".join(candidate)
+    operations = compile_instructions(instructions, len(expected_password))
+    return scramble(operations, expected_password, reverse=True)
 
 
 if __name__ == "__main__":
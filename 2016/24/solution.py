@@ -3,8 +3,12 @@ Advent of Code 2016
 Day 24: Air Duct Spelunking
 https://adventofcode.com/2016/day/24
 """
-from collections import defaultdict, deque
-from itertools import combinations, permutations
+import sys
+from collections import deque
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tours import held_karp
 
 
 def read_input_data():
@@ -15,39 +19,38 @@ def find_numbers_in_map(tiles):
     return {int(tiles[i][j]): (i, j) for i in range(len(tiles)) for j in range(len(tiles[i])) if tiles[i][j].isdigit()}
 
 
-def navigate_hvac_system(map_tiles):
+def distances_from(start, map_tiles, way_points):
+    """One BFS from `start`, returning the steps to every way point it reaches."""
     cardinal_moves = ((-1, 0), (0, 1), (1, 0), (0, -1))
+    targets = {position: number for number, position in way_points.items()}
+    distances = {}
+    q = deque([(0, start)])
+    visited = {start}
+    while q and len(distances) < len(targets):
+        distance, current = q.popleft()
+        if current in targets:
+            distances[targets[current]] = distance
+        y, x = current
+        for cardinal_y, cardinal_x in cardinal_moves:
+            next_y, next_x = y + cardinal_y, x + cardinal_x
+            if map_tiles[next_y][next_x] != "#" and (next_y, next_x) not in visited:
+                q.append((distance + 1, (next_y, next_x)))
+                visited.add((next_y, next_x))
+    return distances
+
+
+def navigate_hvac_system(map_tiles):
     way_points = find_numbers_in_map(map_tiles)
-    shortest_paths = defaultdict(int)
-
-    def bfs_from_a_to_b(start, end):
-        nonlocal cardinal_moves, map_tiles
-        q = deque([(0, start)])
-        visited = set([start])
-        while q:
-            distance, current = q.pop()
-            if current == end:
-                return distance
-            y, x = current
-            for cardinal_y, cardinal_x in cardinal_moves:
-                next_y, next_x = y + cardinal_y, x + cardinal_x
-                if map_tiles[next_y][next_x] != "#" and (next_y, next_x) not in visited:
-                    q.appendleft((distance + 1, (next_y, next_x)))
-                    visited.add((next_y, next_x))
-        return -1
-
-    for a, b in combinations(sorted(way_points), 2):
-        visited_nodes = bfs_from_a_to_b(way_points[a], way_points[b])
-        shortest_paths[(a, b)] = visited_nodes
-        shortest_paths[(b, a)] = visited_nodes
-
-    path_distances = []
-    for permutation in permutations(way_points):
-        points = [(permutation[i], permutation[i + 1]) for i in range(len(permutation) - 1)]
-        path_distance = sum([shortest_paths[p] for p in points])
-        path_distances.append((path_distance, path_distance + shortest_paths[(permutation[-1], permutation[0])]))
-    part_one, _ = min(path_distances, key=lambda x: x[0])
-    _, part_two = min(path_distances, key=lambda x: x[1])
+    numbers = sorted(way_points)
+    shortest_paths = [[0] * len(numbers) for _ in numbers]
+
+    for a in numbers:
+        distances = distances_from(way_points[a], map_tiles, way_points)
+        for b in numbers:
+            shortest_paths[a][b] = distances[b]
+
+    part_one = held_karp(shortest_paths)
+    part_two = held_karp(shortest_paths, cycle=True)
     print(f"{part_one=}, {part_two=}")
 
 
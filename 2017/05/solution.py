@@ -3,27 +3,117 @@ Advent of Code 2017
 Day 5: A Maze of Twisty Trampolines, All Alike
 https://adventofcode.com/2017/day/5
 """
+from array import array
+from functools import lru_cache
+from time import perf_counter
+
+# Cells per block when runs through settled (2 or 3) offsets are cached
+BLOCK_SIZE = 16
 
 
 def read_input_file():
     return [int(line) for line in open("input.txt", "r").read().splitlines()]
 
 
-def follow_jump_instructions(offsets_list, part2=False):
-    position = 0
-    jumps = 0
-    while position < len(offsets_list):
-        offset = offsets_list[position]
-        if part2 and 3 <= offset:
-            offsets_list[position] -= 1
-        else:
-            offsets_list[position] += 1
+def run_increasing(offsets):
+    """Jumps to leave the maze when every offset goes up by one after use."""
+    position, jumps, size = 0, 0, len(offsets)
+    while 0 <= position < size:
+        offset = offsets[position]
+        offsets[position] = offset + 1
+        position += offset
         jumps += 1
+    return jumps
+
+
+def run_strange(offsets):
+    """Jumps to leave the maze when offsets of three or more go down by one instead."""
+    position, jumps, size = 0, 0, len(offsets)
+    while 0 <= position < size:
+        offset = offsets[position]
+        offsets[position] = offset - 1 if offset >= 3 else offset + 1
         position += offset
+        jumps += 1
     return jumps
 
 
+@lru_cache(maxsize=1 << 20)
+def cross_block(bits, unsettled, entry):
+    """
+    Jump through the settled cells of a block: (new bits, where it stopped, jumps).
+
+    A settled cell holds 2 or 3 and is one bit (1 for 3). Those only jump
+    forward and turn into each other, so the run from `entry` to the first
+    unsettled cell, or past the end of the block, depends on nothing else.
+    """
+    position = entry
+    jumps = 0
+    while position < BLOCK_SIZE and not (unsettled >> position) & 1:
+        bit = (bits >> position) & 1
+        bits ^= 1 << position
+        position += 2 + bit
+        jumps += 1
+    return bits, position, jumps
+
+
+def run_strange_blocks(offsets):
+    """
+    run_strange, taking the runs through settled cells a block at a time.
+
+    Offsets that reach 2 or 3 keep swapping between the two for good, and
+    the runner leaves most of the maze that way behind it. Each block keeps
+    those cells as bits next to a mask of the cells that are not settled
+    yet, whose offsets stay in `offsets` and are stepped one by one. The
+    offsets are written back at the end.
+    """
+    size = len(offsets)
+    block_count = -(-size // BLOCK_SIZE)
+    bits = [0] * block_count
+    unsettled = [0] * block_count
+    # Cells past the end count as unsettled, so runs stop there
+    for position in range(block_count * BLOCK_SIZE):
+        index, cell = divmod(position, BLOCK_SIZE)
+        if position < size and offsets[position] in (2, 3):
+            bits[index] |= (offsets[position] - 2) << cell
+        else:
+            unsettled[index] |= 1 << cell
+
+    position, jumps = 0, 0
+    while 0 <= position < size:
+        index, cell = divmod(position, BLOCK_SIZE)
+        if (unsettled[index] >> cell) & 1:
+            offset = offsets[position]
+            new_offset = offset - 1 if offset >= 3 else offset + 1
+            offsets[position] = new_offset
+            if new_offset == 2 or new_offset == 3:
+                unsettled[index] &= ~(1 << cell)
+                bits[index] |= (new_offset - 2) << cell
+            position += offset
+            jumps += 1
+        else:
+            bits[index], cell, block_jumps = cross_block(bits[index], unsettled[index], cell)
+            position = index * BLOCK_SIZE + cell
+            jumps += block_jumps
+
+    for position in range(size):
+        index, cell = divmod(position, BLOCK_SIZE)
+        if not (unsettled[index] >> cell) & 1:
+            offsets[position] = 2 + ((bits[index] >> cell) & 1)
+    return jumps
+
+
+def follow_jump_instructions(offsets_list, part2=False, skip_blocks=True):
+    """Jumps to leave the maze; skip_blocks takes part two's settled runs from a cache."""
+    offsets = array("i", offsets_list)
+    if not part2:
+        return run_increasing(offsets)
+    return run_strange_blocks(offsets) if skip_blocks else run_strange(offsets)
+
+
 if __name__ == "__main__":
     data = read_input_file()
-    print(follow_jump_instructions(data.copy()))
-    print(follow_jump_instructions(data.copy(), True))
+    for part2, skip_blocks in ((False, False), (True, False), (True, True)):
+        started = perf_counter()
+        steps = follow_jump_instructions(data, part2, skip_blocks)
+        elapsed = perf_counter() - started
+        print(f"{steps} ({steps / elapsed:,.0f} steps/s)")
@@ -3,36 +3,34 @@ Advent of Code 2017
 Day 6: Memory Reallocation
 https://adventofcode.com/2017/day/6
 """
+import sys
+from pathlib import Path
 from re import findall
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from cycles import find_cycle
+
 
 def read_input_file():
     return list(map(int, findall("(\d+)", open("input.txt", "r").read().strip())))
 
 
+def redistribute(banks):
+    """Empty the fullest bank (the first one on ties) into the ones after it, round robin."""
+    banks = list(banks)
+    size = len(banks)
+    position = banks.index(max(banks))
+    blocks, banks[position] = banks[position], 0
+    every, rest = divmod(blocks, size)
+    for offset in range(1, size + 1):
+        banks[(position + offset) % size] += every + (offset <= rest)
+    return tuple(banks)
+
+
 def debug_loop(banks_state):
-    previous_states = set()
-    trace = []
-    cycle_detected = False
-    while not cycle_detected:
-        position = banks_state.index(max(banks_state))
-        blocks_to_distribute = banks_state[position]
-        banks_state[position] = 0
-        while blocks_to_distribute:
-            if position < 15:
-                banks_state[position + 1] += 1
-            else:
-                banks_state[0] += 1
-                position = -1
-            blocks_to_distribute -= 1
-            position += 1
-        current_banks = tuple(banks_state)
-        if current_banks in previous_states:
-            part_one = len(previous_states) + 1
-            part_two = len(trace) - trace.index(current_banks)
-            cycle_detected = True
-        previous_states.add(current_banks)
-        trace.append(current_banks)
+    start, period = find_cycle(redistribute, tuple(banks_state))
+    part_one = start + period
+    part_two = period
     print(f"{part_one=}, {part_two=}")
 
 
@@ -3,39 +3,85 @@ Advent of Code 2017
 Day 15: Dueling Generators
 https://adventofcode.com/2017/day/15
 """
+from functools import lru_cache, partial
+from multiprocessing import Pool, cpu_count
 from re import findall
-from itertools import islice
+
+import numpy as np
+
+MODULUS = 2147483647
+FACTOR_A, FACTOR_B = 16807, 48271
+BLOCK_SIZE = 1 << 20
+LOW_BITS = 0xFFFF
 
 
 def read_input_file():
     return tuple(map(int, findall(r"-?\d+", open("input.txt", "r").read())))
 
 
-def gen(val, mult, check=1):
-    while True:
-        val = (val * mult) % 2147483647
-        if val % check == 0:
-            yield val
+@lru_cache(maxsize=None)
+def jump_multipliers(factor, count):
+    """factor^1 .. factor^count modulo MODULUS, doubling the known powers each round."""
+    powers = np.array([factor], dtype=np.uint64)
+    while len(powers) < count:
+        step = pow(factor, len(powers), MODULUS)
+        powers = np.concatenate((powers, powers * np.uint64(step) % np.uint64(MODULUS)))
+    return powers[:count]
 
 
-def part_one(values):
-    initial_a, initial_b = values
-    generator_a, generator_b = gen(initial_a, 16807), gen(initial_b, 48271)
-    judges_count = 0
-    for a, b in islice(zip(generator_a, generator_b), 40_000_000):
-        if a % 65536 == b % 65536:
-            judges_count += 1
-    return judges_count
+def block_values(start, factor, index, size=BLOCK_SIZE):
+    """
+    Values `index * BLOCK_SIZE + 1` onwards of a generator, `size` of them.
+
+    The block's seed jumps straight there with one modular power, so blocks
+    do not depend on each other. Seeds and multipliers are below 2^31, so
+    their products fit in uint64.
+    """
+    seed = start * pow(factor, index * BLOCK_SIZE, MODULUS) % MODULUS
+    return np.uint64(seed) * jump_multipliers(factor, size) % np.uint64(MODULUS)
+
+
+def block_matches(starts, block):
+    """Pairs in a block whose values agree in the lowest 16 bits."""
+    index, size = block
+    a = block_values(starts[0], FACTOR_A, index, size)
+    b = block_values(starts[1], FACTOR_B, index, size)
+    return int(np.count_nonzero((a & np.uint64(LOW_BITS)) == (b & np.uint64(LOW_BITS))))
+
+
+def accepted_low_bits(start, factor, multiple, index):
+    """Lowest 16 bits of the values in a block that are multiples of `multiple`."""
+    values = block_values(start, factor, index)
+    return (values[values % np.uint64(multiple) == 0] & np.uint64(LOW_BITS)).astype(np.uint16)
+
+
+def accepted_stream(pool, workers, start, factor, multiple, count):
+    """The first `count` accepted values (low bits), one block per worker at a time."""
+    parts, found, index = [], 0, 0
+    while found < count:
+        for part in pool.map(partial(accepted_low_bits, start, factor, multiple), range(index, index + workers)):
+            parts.append(part)
+            found += len(part)
+        index += workers
+    return np.concatenate(parts)[:count]
+
+
+def part_one(values, num_processes=None):
+    pairs = 40_000_000
+    blocks = [(index, min(BLOCK_SIZE, pairs - index * BLOCK_SIZE))
+              for index in range(-(-pairs // BLOCK_SIZE))]
+    with Pool(processes=num_processes) as pool:
+        return sum(pool.map(partial(block_matches, values), blocks))
 
 
-def part_two(values):
+def part_two(values, num_processes=None):
+    pairs = 5_000_000
     initial_a, initial_b = values
-    generator_a, generator_b = gen(initial_a, 16807, 4), gen(initial_b, 48271, 8)
-    judges_count = 0
-    for a, b in islice(zip(generator_a, generator_b), 5_000_000):
-        if a % 65536 == b % 65536:
-            judges_count += 1
-    return judges_count
+    workers = num_processes or cpu_count()
+    with Pool(processes=workers) as pool:
+        a = accepted_stream(pool, workers, initial_a, FACTOR_A, 4, pairs)
+        b = accepted_stream(pool, workers, initial_b, FACTOR_B, 8, pairs)
+    return int(np.count_nonzero(a == b))
 
 
 if __name__ == "__main__":
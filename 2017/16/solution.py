@@ -3,38 +3,73 @@ Advent of Code 2017
 Day 16: Permutation Promenade
 https://adventofcode.com/2017/day/16
 """
+from string import ascii_lowercase
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip().split(",")
 
 
-def perform_dance(programs, dance_steps):
+def compile_dance(dance_steps, line_length):
+    """
+    Reduce a dance to a position permutation and a label permutation.
+
+    Spins and exchanges only move places around, while partner swaps only
+    rename programs, so the two kinds of move commute. Starting from
+    alphabetical order, after the dance the program at place i is
+    labels[positions[i]].
+    """
+    positions = list(range(line_length))
+    labels = list(range(line_length))
+    # holder[name] is the original program currently called name
+    holder = list(range(line_length))
+
     for step in dance_steps:
         match step[0]:
             case "s":
-                size = int(step[1:])
-                programs = programs[-size:] + programs[:-size]
+                size = int(step[1:]) % line_length
+                positions = positions[-size:] + positions[:-size] if size else positions
             case "x":
-                sep = step.index("/")
-                a, b = int(step[1:sep]), int(step[sep+1:])
-                programs[a], programs[b] = programs[b], programs[a]
+                a, b = map(int, step[1:].split("/"))
+                positions[a], positions[b] = positions[b], positions[a]
             case "p":
-                a, b = programs.index(step[1]), programs.index(step[-1])
-                programs[a], programs[b] = programs[b], programs[a]
-    return programs
+                a, b = (ascii_lowercase.index(name) for name in step[1:].split("/"))
+                i, j = holder[a], holder[b]
+                labels[i], labels[j] = b, a
+                holder[a], holder[b] = j, i
+
+    return positions, labels
+
+
+def compose(first, second):
+    """The permutation i -> first[second[i]]."""
+    return [first[i] for i in second]
+
+
+def power(permutation, exponent):
+    """Apply a permutation `exponent` times, by repeated squaring."""
+    result = list(range(len(permutation)))
+    while exponent:
+        if exponent & 1:
+            result = compose(result, permutation)
+        permutation = compose(permutation, permutation)
+        exponent >>= 1
+    return result
+
+
+def perform_dance(dance_steps, line_length=16, repetitions=1):
+    """Line of programs after dancing `repetitions` times, starting from alphabetical order."""
+    positions, labels = compile_dance(dance_steps, line_length)
+    positions, labels = power(positions, repetitions), power(labels, repetitions)
+    return "".join(ascii_lowercase[labels[p]] for p in positions)
 
 
 def part_one(dance_steps):
-    return "".join(perform_dance([p for p in "abcdefghijklmnop"], dance_steps))
+    return perform_dance(dance_steps)
 
 
 def part_two(dance_steps):
-    programs, previous = [p for p in "abcdefghijklmnop"], []
-    while (state := tuple(programs)) not in previous:
-        previous.append(state)
-        programs = perform_dance(programs, dance_steps)
-    return "".join(previous[1_000_000_000 % len(previous)])
+    return perform_dance(dance_steps, repetitions=1_000_000_000)
 
 
 if __name__ == '__main__':
@@ -6,8 +6,13 @@ https://adventofcode.com/2017/day/20
 from re import match as regex_match
 from collections import namedtuple
 
+import numpy as np
+
 Particle = namedtuple('Particle', ['pos', 'vel', 'acc'])
 
+# Pairs of particles compared at once when looking for collisions
+PAIR_BLOCK_SIZE = 1 << 20
+
 
 def read_input_file():
     regex = r"p=<(.*?)>, v=<(.*?)>, a=<(.*?)>"
@@ -15,30 +20,117 @@ def read_input_file():
     return [Particle(*[tuple(map(int, t.split(","))) for t in line]) for line in lines]
 
 
-def manhattan_distance(particle):
-    return sum(abs(k) for k in particle.pos)
+def trajectories(particles):
+    """
+    Coefficients of every particle's doubled position as a polynomial in the tick t.
+
+    The velocity is updated before the position, so after t ticks each axis is
+    at p + v t + a t (t + 1) / 2, i.e. twice that is a t^2 + (2v + a) t + 2p.
+    Returns three (n, 3) int64 arrays: the t^2, t and constant coefficients.
+    """
+    pos, vel, acc = (np.array(column, dtype=np.int64).reshape(-1, 3) for column in zip(*particles))
+    return acc, 2 * vel + acc, 2 * pos
+
+
+def integer_roots(qa, qb, qc):
+    """
+    Candidate integer ticks t >= 0 with qa t^2 + qb t + qc = 0, as (t, valid) arrays.
+
+    A polynomial that is zero everywhere gets the candidate 0.
+    """
+    candidates = []
+    # Quadratic: both roots, when the discriminant is a square
+    discriminant = qb * qb - 4 * qa * qc
+    root = np.sqrt(np.maximum(discriminant, 0)).astype(np.int64)
+    root -= root * root > discriminant
+    root += (root + 1) * (root + 1) <= discriminant
+    square = (qa != 0) & (discriminant >= 0) & (root * root == discriminant)
+    denominator = np.where(qa != 0, 2 * qa, 1)
+    for numerator in (-qb - root, -qb + root):
+        candidates.append((numerator // denominator, square & (numerator % denominator == 0)))
+    # Linear: qb t + qc = 0
+    linear = (qa == 0) & (qb != 0)
+    divisor = np.where(linear, qb, 1)
+    candidates.append((-qc // divisor, linear & (qc % divisor == 0)))
+    # Constant
+    candidates.append((np.zeros_like(qa), (qa == 0) & (qb == 0) & (qc == 0)))
+    return [(t, valid & (t >= 0)) for t, valid in candidates]
 
 
-def move_particle(particle):
-    new_vel = tuple(map(sum, zip(particle.vel, particle.acc)))
-    new_pos = tuple(map(sum, zip(particle.pos, new_vel)))
-    return Particle(new_pos, new_vel, particle.acc)
+def collision_times(a, b, c):
+    """
+    Earliest tick t >= 0 at which a t^2 + b t + c is zero on every axis, or -1.
+
+    The arrays hold the coefficients of the difference between two particles,
+    one pair per row. Candidate roots come from the first axis whose polynomial
+    is not identically zero (if none is, the pair collides at once) and are then
+    checked on all three axes.
+    """
+    nonzero = (a != 0) | (b != 0) | (c != 0)
+    rows = np.arange(len(a))
+    axis = np.argmax(nonzero, axis=1)
+
+    earliest = np.full(len(a), -1, dtype=np.int64)
+    for t, valid in integer_roots(a[rows, axis], b[rows, axis], c[rows, axis]):
+        t_column = t[:, None]
+        valid &= ((a * t_column + b) * t_column + c == 0).all(axis=1)
+        earliest = np.where(valid & ((earliest < 0) | (t < earliest)), t, earliest)
+    return earliest
 
 
 def part_one(particles):
-    for _ in range(500):
-        particles = [move_particle(particle) for particle in particles]
-    return particles.index(min(particles, key=manhattan_distance))
+    """
+    The particle that stays closest to the origin in the long run.
+
+    Once t is large enough, every axis keeps the sign of its leading nonzero
+    coefficient, so the distance is itself a quadratic in t whose coefficients
+    are compared from the highest power down. Equal ones stay level forever,
+    and the lowest index wins.
+    """
+    a, b, c = trajectories(particles)
+    sign = np.where(a != 0, np.sign(a), np.where(b != 0, np.sign(b), np.sign(c)))
+    keys = [(sign * coefficient).sum(axis=1) for coefficient in (a, b, c)]
+    return int(np.lexsort((np.arange(len(a)), keys[2], keys[1], keys[0]))[0])
 
 
 def part_two(particles):
-    for _ in range(50):
-        positions = [particle.pos for particle in particles]
-        if len(set(positions)) < len(positions):
-            # Keep only the particles with unique positions
-            particles = [particle for particle, position in zip(particles, positions) if positions.count(position) == 1]
-        particles = [move_particle(particle) for particle in particles]
-    return len(particles)
+    """
+    Particles left after every collision, resolved in the order they happen.
+
+    Collision times are solved for every pair, block by block, and only the
+    pairs that do collide are kept. Going through those by time, a pair only
+    counts when both particles are still there at that tick.
+    """
+    a, b, c = trajectories(particles)
+    n = len(a)
+    times, firsts, seconds = [], [], []
+    block = max(1, PAIR_BLOCK_SIZE // max(n, 1))
+    for low in range(0, n, block):
+        high = min(n, low + block)
+        i, j = np.nonzero(np.arange(high - low)[:, None] + low < np.arange(low, n)[None, :])
+        i += low
+        j += low
+        # Most pairs never meet even on the x axis; only the others are solved in full
+        roots_x = integer_roots(a[j, 0] - a[i, 0], b[j, 0] - b[i, 0], c[j, 0] - c[i, 0])
+        meet_x = np.logical_or.reduce([valid for _, valid in roots_x])
+        i, j = i[meet_x], j[meet_x]
+        t = collision_times(a[j] - a[i], b[j] - b[i], c[j] - c[i])
+        hit = t >= 0
+        times.append(t[hit])
+        firsts.append(i[hit])
+        seconds.append(j[hit])
+
+    times, firsts, seconds = (np.concatenate(values) for values in (times, firsts, seconds))
+    order = np.argsort(times, kind="stable")
+    times, firsts, seconds = times[order], firsts[order], seconds[order]
+
+    alive = np.ones(n, dtype=bool)
+    bounds = np.flatnonzero(np.diff(times)) + 1
+    for first, second in zip(np.split(firsts, bounds), np.split(seconds, bounds)):
+        both = alive[first] & alive[second]
+        alive[first[both]] = False
+        alive[second[both]] = False
+    return int(alive.sum())
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ Advent of Code 2017
 Day 21: Fractal Art
 https://adventofcode.com/2017/day/21
 """
+from collections import Counter
+
 import numpy as np
 
 
@@ -20,25 +22,62 @@ def translate_to_np(string):
     return np.array([[ch == "#" for ch in line] for line in string.split("/")])
 
 
+def enhance(grid, rules):
+    size = len(grid)
+    by = 2 if size % 2 == 0 else 3
+    by_1 = by + 1
+    new_size = size * by_1 // by
+    new_grid = np.empty((new_size, new_size), dtype=bool)
+    squares = range(0, size, by)
+    new_squares = range(0, new_size, by_1)
+
+    for i, new_i in zip(squares, new_squares):
+        for j, new_j in zip(squares, new_squares):
+            square = grid[i:i + by, j:j + by]
+            new_grid[new_i:new_i + by_1, new_j:new_j + by_1] = rules[square.tobytes()]
+
+    return new_grid
+
+
 def count_pixels_in_on_state(rules, iterations=5):
-    grid = translate_to_np(".#./..#/###")
-    for _ in range(iterations):
-        size = len(grid)
-        by = 2 if size % 2 == 0 else 3
-        by_1 = by + 1
-        new_size = size * by_1 // by
-        new_grid = np.empty((new_size, new_size), dtype=bool)
-        squares = range(0, size, by)
-        new_squares = range(0, new_size, by_1)
-
-        for i, new_i in zip(squares, new_squares):
-            for j, new_j in zip(squares, new_squares):
-                square = grid[i:i + by, j:j + by]
-                new_grid[new_i:new_i + by_1, new_j:new_j + by_1] = rules[square.tobytes()]
-
-        grid = new_grid
-
-    return int(grid.sum())
+    """
+    Count the pixels that are on without ever building the full grid.
+
+    Three iterations take a 3x3 block to a 9x9 grid (3 -> 4 -> 6 -> 9), which
+    splits into nine 3x3 blocks that never interact again. So the picture is
+    tracked as a multiset of 3x3 blocks, stepped three iterations at a time,
+    and only the last one or two iterations are played out per distinct block.
+    Per-block results are memoized, so memory is bounded by the number of
+    distinct blocks rather than the size of the picture.
+    """
+    transitions, on_counts = {}, {}
+
+    def next_blocks(block):
+        if block not in transitions:
+            grid = np.frombuffer(block, dtype=bool).reshape(3, 3)
+            for _ in range(3):
+                grid = enhance(grid, rules)
+            transitions[block] = Counter(grid[i:i + 3, j:j + 3].tobytes()
+                                         for i in range(0, 9, 3) for j in range(0, 9, 3))
+        return transitions[block]
+
+    def pixels_on(block, remaining):
+        if (block, remaining) not in on_counts:
+            grid = np.frombuffer(block, dtype=bool).reshape(3, 3)
+            for _ in range(remaining):
+                grid = enhance(grid, rules)
+            on_counts[block, remaining] = int(grid.sum())
+        return on_counts[block, remaining]
+
+    blocks = Counter([translate_to_np(".#./..#/###").tobytes()])
+    for _ in range(iterations // 3):
+        stepped = Counter()
+        for block, copies in blocks.items():
+            for child, count in next_blocks(block).items():
+                stepped[child] += copies * count
+        blocks = stepped
+
+    return sum(copies * pixels_on(block, iterations % 3) for block, copies in blocks.items())
 
 
 if __name__ == "__main__":
@@ -3,38 +3,70 @@ Advent of Code 2018
 Day 11: Chronal Charge
 https://adventofcode.com/2018/day/11
 """
-from collections import defaultdict
-from itertools import product
+import numpy as np
+
+GRID_SIZE = 300
 
 
 def read_input_file():
     return int(open("input.txt", "r").read().strip())
 
 
-def both_parts(serial):
-    grid_sums, partial_sums, part_one = {}, defaultdict(int), ""
+def power_levels(serials, grid_size=GRID_SIZE):
+    """Power grids for a batch of serials, indexed [serial, x - 1, y - 1]."""
+    serials = np.asarray(serials, dtype=np.int64).reshape(-1, 1, 1)
+    rack_id = np.arange(1, grid_size + 1, dtype=np.int64).reshape(1, -1, 1) + 10
+    y = np.arange(1, grid_size + 1, dtype=np.int64).reshape(1, 1, -1)
+    return (rack_id * y + serials) * rack_id // 100 % 10 - 5
+
+
+def summed_area_table(grids):
+    """Summed-area tables with a zero border, so sat[:, i, j] is the sum of grids[:, :i, :j]."""
+    batch, width, height = grids.shape
+    sat = np.zeros((batch, width + 1, height + 1), dtype=np.int64)
+    sat[:, 1:, 1:] = grids.cumsum(axis=1).cumsum(axis=2)
+    return sat
+
+
+def window_totals(sat, size):
+    """Total power of every size x size square, indexed [serial, x - 1, y - 1] of its top-left cell."""
+    return (sat[:, size:, size:] - sat[:, :-size, size:]
+            - sat[:, size:, :-size] + sat[:, :-size, :-size])
 
-    def power_level(x, y):
-        nonlocal serial
-        return ((((x + 10) * y + serial) * (x + 10)) // 10 ** 2 % 10) - 5
 
-    def get_partial_sum(x, y):
-        return power_level(x + 1, y + 1) + partial_sums[x, y - 1] + partial_sums[x - 1, y] - partial_sums[x - 1, y - 1]
+def best_squares(serials, sizes, grid_size=GRID_SIZE):
+    """
+    Find the square with the largest total power for each serial.
 
-    for j, i in product(range(300), range(300)):
-        partial_sums[(i, j)] = get_partial_sum(i, j)
+    Ties go to the smallest size, then the smallest x, then the smallest y.
 
-    for size in range(2, 300):
-        for j in range(size - 1, 300):
-            for i in range(size - 1, 300):
-                a, b = i - size, j - size
-                total_sum = partial_sums[(i, j)] + partial_sums[(a, b)] - partial_sums[(a, j)] - partial_sums[(i, b)]
-                grid_sums[total_sum] = (a + 2, b + 2, size)
-        if size == 3:
-            x_3, y_3, _ = grid_sums[max(grid_sums)]
-            part_one = ",".join(map(str, (x_3, y_3)))
+    Returns:
+        list: (x, y, size, total) for every serial, in order
+    """
+    sat = summed_area_table(power_levels(serials, grid_size))
+    batch = sat.shape[0]
+    best = [None] * batch
+
+    for size in sizes:
+        totals = window_totals(sat, size).reshape(batch, -1)
+        # argmax picks the first maximum: the smallest x, then the smallest y
+        positions = totals.argmax(axis=1)
+        span = grid_size - size + 1
+        for k, position in enumerate(positions):
+            total = int(totals[k, position])
+            if best[k] is None or total > best[k][3]:
+                x, y = divmod(int(position), span)
+                best[k] = (x + 1, y + 1, size, total)
+
+    return best
+
+
+def both_parts(serial):
+    (x_3, y_3, _, _), = best_squares([serial], [3])
+    part_one = ",".join(map(str, (x_3, y_3)))
 
-    part_two = ",".join(map(str, grid_sums[max(grid_sums)]))
+    (x, y, size, _), = best_squares([serial], range(1, GRID_SIZE + 1))
+    part_two = ",".join(map(str, (x, y, size)))
     print(f"{part_one=}, {part_two=}")
 
 
@@ -3,6 +3,11 @@ Advent of Code 2018
 Day 12: Subterranean Sustainability
 https://adventofcode.com/2018/day/12
 """
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from cycles import extrapolate
 
 
 def read_input_file():
@@ -16,39 +21,33 @@ def read_input_file():
     return initial_state, rules
 
 
-def plant_pots_state(state, rules, generations):
-    pad, offset = 10, -10
-    state = [0] * pad + list(state) + [0] * pad
+def next_generation(state, rules):
+    """The pots one generation on, trimmed to run from the first plant to the last."""
+    pots, offset = state
+    padded = (0,) * 4 + pots + (0,) * 4
+    pots = tuple(rules.get(padded[j:j + 5], 0) for j in range(len(padded) - 4))
+    if 1 not in pots:
+        return (), 0
+    first, last = pots.index(1), len(pots) - pots[::-1].index(1)
+    return pots[first:last], offset - 2 + first
 
-    for i in range(1, generations + 1):
-        next_state = list(state)
-        for j in range(0, len(state) - 5):
-            k = tuple(state[j:j+5])
-            next_state[j+2] = rules.get(k, 0)
-        state = next_state
 
-        # Trim state
-        if not any(state[:2*pad]):
-            state = state[pad:]
-            offset += pad
+def pot_number_sum(state):
+    pots, offset = state
+    return sum(number for number, pot in enumerate(pots, offset) if pot)
 
-        if any(state[-pad:]):
-            state += [0] * pad
 
-    return state, offset
+def plant_pots_sum(state, rules, generations):
+    return extrapolate(lambda s: next_generation(s, rules), (tuple(state), 0), generations,
+                       pot_number_sum, key=lambda s: s[0])
 
 
 def part_one(state, rules):
-    state, offset = plant_pots_state(state, rules, 20)
-    return sum(_[1] for _ in zip(state, range(offset, offset + len(state))) if _[0])
+    return plant_pots_sum(state, rules, 20)
 
 
 def part_two(state, rules):
-    state, offset = plant_pots_state(state, rules, 1000)
-    # Pattern begins moving one step to the right per generation
-    generations_target = 50_000_000_000
-    offset = offset + generations_target - 1000
-    return sum(_[1] for _ in zip(state, range(offset, offset + len(state))) if _[0])
+    return plant_pots_sum(state, rules, 50_000_000_000)
 
 
 if __name__ == "__main__":
@@ -3,34 +3,69 @@ Advent of Code 2018
 Day 14: Chocolate Charts
 https://adventofcode.com/2018/day/14
 """
+from itertools import islice
 
 
 def read_input_file():
     return open("input.txt", "r").read().strip()
 
 
+def recipe_scores(initial_size=1 << 16):
+    """
+    Yield the scores on the scoreboard in order, forever.
+
+    The board is a bytearray, one byte per score, doubled whenever it runs
+    out of room, so the scores seen so far are never copied one by one.
+    """
+    board = bytearray(max(initial_size, 4))
+    board[0], board[1] = 3, 7
+    count = 2
+    elf_1, elf_2 = 0, 1
+    yield 3
+    yield 7
+    while True:
+        if count + 2 > len(board):
+            board.extend(bytes(len(board)))
+        score_1 = board[elf_1]
+        score_2 = board[elf_2]
+        total = score_1 + score_2
+        if total >= 10:
+            board[count] = 1
+            board[count + 1] = total - 10
+            count += 2
+            yield 1
+            yield total - 10
+        else:
+            board[count] = total
+            count += 1
+            yield total
+        elf_1 += 1 + score_1
+        if elf_1 >= count:
+            elf_1 %= count
+        elf_2 += 1 + score_2
+        if elf_2 >= count:
+            elf_2 %= count
+
+
+def find_sequence(digits):
+    """Number of recipes before `digits` first appears, matching the last k scores as one integer."""
+    size = len(digits)
+    target = int(digits)
+    modulus = 10 ** size
+    window = 0
+    for position, score in enumerate(recipe_scores()):
+        window = (window * 10 + score) % modulus
+        if window == target and position + 1 >= size:
+            return position + 1 - size
+
+
 def part_one(puzzle_input):
     value = int(puzzle_input)
-    recipe_scores = [3, 7]
-    elf_1, elf_2 = 0, 1
-    while len(recipe_scores) < value + 10:
-        recipes_sum = recipe_scores[elf_1] + recipe_scores[elf_2]
-        recipe_scores.extend(divmod(recipes_sum, 10) if recipes_sum >= 10 else (recipes_sum,))
-        elf_1 = (elf_1 + 1 + recipe_scores[elf_1]) % len(recipe_scores)
-        elf_2 = (elf_2 + 1 + recipe_scores[elf_2]) % len(recipe_scores)
-    print("".join(str(score) for score in recipe_scores[value:value + 10]))
+    print("".join(map(str, islice(recipe_scores(value + 12), value, value + 10))))
 
 
 def part_two(puzzle_input):
-    digits = [int(digit) for digit in puzzle_input]
-    recipe_scores = [3, 7]
-    elf_1, elf_2 = 0, 1
-    while recipe_scores[-len(digits):] != digits and recipe_scores[-len(digits) - 1:-1] != digits:
-        recipes_sum = recipe_scores[elf_1] + recipe_scores[elf_2]
-        recipe_scores.extend(divmod(recipes_sum, 10) if recipes_sum >= 10 else (recipes_sum,))
-        elf_1 = (elf_1 + 1 + recipe_scores[elf_1]) % len(recipe_scores)
-        elf_2 = (elf_2 + 1 + recipe_scores[elf_2]) % len(recipe_scores)
-    print(len(recipe_scores) - len(digits) - (0 if recipe_scores[-len(digits):] == digits else 1))
+    print(find_sequence(puzzle_input))
 
 
 if __name__ == "__main__":
@@ -3,10 +3,19 @@ Advent of Code 2018
 Day 22: Mode Maze
 https://adventofcode.com/2018/day/22
 """
-from itertools import product
-from networkx import Graph, dijkstra_path_length
+from heapq import heappop, heappush
 from re import findall
 
+# Region types, and the tools numbered so that tool == region type is the one
+# tool that cannot be used there: rocky forbids neither, wet the torch and
+# narrow the climbing gear.
+ROCKY, WET, NARROW = 0, 1, 2
+NEITHER, TORCH, CLIMBING_GEAR = 0, 1, 2
+
+SWITCH_MINUTES = 7
+# Bits of a packed search state used by each coordinate
+COORDINATE_BITS = 20
+
 
 def read_input_file():
     lines = open("input.txt", "r").read().splitlines()
@@ -15,50 +24,112 @@ def read_input_file():
     return depth, target
 
 
-def generate_cave(depth, target, bottom_right=None):
-    if bottom_right is None:
-        bottom_right = target
-    cave = {}
-    for y, x in product(range(0, bottom_right[1]+1), range(0, bottom_right[0]+1)):
-        if (x, y) in ((0, 0), target):
+class Cave:
+    """
+    Erosion levels of the cave, computed only as far as they are needed.
+
+    Levels are memoized row by row; asking for a region beyond the computed
+    area extends the rows or adds rows up to it, at least doubling whichever
+    dimension was exceeded so growth stays amortized.
+    """
+
+    def __init__(self, depth, target):
+        self.depth = depth
+        self.target = target
+        self.width = 0
+        self.erosion = []
+
+    def _erosion_level(self, x, y, left, above):
+        if (x, y) in ((0, 0), self.target):
             geologic_index = 0
         elif y == 0:
             geologic_index = x * 16807
         elif x == 0:
             geologic_index = y * 48271
         else:
-            geologic_index = cave[(x-1, y)][1] * cave[(x, y-1)][1]
-        erosion_level = (geologic_index + depth) % 20183
-        risk_level = erosion_level % 3
-        cave[(x, y)] = (geologic_index, erosion_level, risk_level)
+            geologic_index = left * above
+        return (geologic_index + self.depth) % 20183
+
+    def _grow(self, width, height):
+        width = max(width, self.width)
+        previous = self.erosion[-1] if self.erosion else None
+        for y, row in enumerate(self.erosion):
+            for x in range(len(row), width):
+                row.append(self._erosion_level(x, y, row[x - 1] if x else 0,
+                                               self.erosion[y - 1][x] if y else 0))
+            previous = row
+        for y in range(len(self.erosion), height):
+            row = []
+            for x in range(width):
+                row.append(self._erosion_level(x, y, row[x - 1] if x else 0,
+                                               previous[x] if y else 0))
+            self.erosion.append(row)
+            previous = row
+        self.width = width
 
-    return cave
+    def region_type(self, x, y):
+        if x >= self.width or y >= len(self.erosion):
+            height = len(self.erosion)
+            self._grow(max(x + 1, 2 * self.width) if x >= self.width else self.width,
+                       max(y + 1, 2 * height) if y >= height else height)
+        return self.erosion[y][x] % 3
 
 
 def part_one(depth, target):
-    cave_map = generate_cave(depth, target)
-    return sum([t[2] for t in cave_map.values()])
+    cave = Cave(depth, target)
+    return sum(cave.region_type(x, y)
+               for y in range(target[1] + 1)
+               for x in range(target[0] + 1))
 
 
 def part_two(depth, target):
-    torch, climbing_gear, neither = 0, 1, 2
-    rocky, wet, narrow = 0, 1, 2
-    available_tools = {rocky: (torch, climbing_gear), wet: (climbing_gear, neither), neither: (torch, neither)}
-    expansion_size = 28  # Required expansion to find the shortest path
-    expanded_bottom_right = (target[0] + expansion_size, target[1] + expansion_size)
-    cave = generate_cave(depth, target, expanded_bottom_right)
-    graph = Graph()
-
-    for y, x in product(range(0, expanded_bottom_right[1]+1), range(0, expanded_bottom_right[0]+1)):
-        tools = available_tools[cave[(x, y)][2]]
-        graph.add_edge((x, y, tools[0]), (x, y, tools[1]), weight=7)
-        for new_x, new_y in [tuple(sum(t) for t in zip((x, y), d)) for d in ((0, 1), (1, 0), (0, -1), (-1, 0))]:
-            if 0 <= new_x <= expanded_bottom_right[0] and 0 <= new_y <= expanded_bottom_right[1]:
-                new_tools = available_tools[cave[(new_x, new_y)][2]]
-                for tool in set(tools).intersection(set(new_tools)):
-                    graph.add_edge((x, y, tool), (new_x, new_y, tool), weight=1)
-
-    return dijkstra_path_length(graph, (0, 0, torch), (target[0], target[1], torch))
+    """
+    A* over (x, y, tool) states packed into single ints.
+
+    The heuristic is the Manhattan distance to the target plus one tool
+    switch unless the torch is already equipped, which never overestimates,
+    so the first time the target is popped its time is exact. Raises
+    ValueError when the mouth and target are wet, as the torch cannot be
+    held there and no route exists.
+    """
+    cave = Cave(depth, target)
+    if cave.region_type(0, 0) == TORCH or cave.region_type(*target) == TORCH:
+        raise ValueError(f"no route: depth {depth} makes the mouth and target wet")
+    target_x, target_y = target
+    mask = (1 << COORDINATE_BITS) - 1
+
+    def pack(x, y, tool):
+        return (((x << COORDINATE_BITS) | y) << 2) | tool
+
+    def estimate(x, y, tool):
+        return abs(target_x - x) + abs(target_y - y) + (0 if tool == TORCH else SWITCH_MINUTES)
+
+    start = pack(0, 0, TORCH)
+    goal = pack(target_x, target_y, TORCH)
+    best = {start: 0}
+    queue = [(estimate(0, 0, TORCH), 0, start)]
+
+    while queue:
+        _, minutes, state = heappop(queue)
+        if state == goal:
+            return minutes
+        if minutes > best[state]:
+            continue
+        tool = state & 3
+        y = (state >> 2) & mask
+        x = state >> (2 + COORDINATE_BITS)
+
+        # Switch to the other tool allowed in this region
+        moves = [(x, y, 3 - cave.region_type(x, y) - tool, minutes + SWITCH_MINUTES)]
+        for new_x, new_y in ((x + 1, y), (x, y + 1), (x - 1, y), (x, y - 1)):
+            if new_x >= 0 and new_y >= 0 and cave.region_type(new_x, new_y) != tool:
+                moves.append((new_x, new_y, tool, minutes + 1))
+
+        for new_x, new_y, new_tool, new_minutes in moves:
+            new_state = pack(new_x, new_y, new_tool)
+            if new_minutes < best.get(new_state, new_minutes + 1):
+                best[new_state] = new_minutes
+                heappush(queue, (new_minutes + estimate(new_x, new_y, new_tool), new_minutes, new_state))
 
 
 if __name__ == "__main__":
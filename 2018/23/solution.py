@@ -4,9 +4,12 @@ Day 23: Experimental Emergency Teleportation
 https://adventofcode.com/2018/day/23
 """
 from functools import reduce
-from queue import PriorityQueue
+from heapq import heappop, heappush
+from itertools import count
 from re import findall
 
+import numpy as np
+
 
 def read_input_file():
     return [tuple(map(int, findall(r"-?\d+", line))) for line in open("input.txt", "r").read().splitlines()]
@@ -22,25 +25,130 @@ def part_one(bots):
     return sum([manhattan_distance(xyz, abc) <= radius for *abc, _ in bots])
 
 
+# Normals of the faces of an octahedron. A point's coordinates along them,
+# u = (x+y+z, x+y-z, x-y+z, -x+y+z), turn every bot's range into a box, and
+# the point's distance from the origin into max(|u|).
+FACE_NORMALS = np.array([(1, 1, 1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)], dtype=np.int64)
+
+
+def has_point(lows, highs, limit):
+    """
+    Whether the box [lows, highs] in face coordinates holds a grid point with max(|u|) <= limit.
+
+    Face coordinates come from a grid point exactly when u0 = u1 + u2 + u3
+    and u1, u2, u3 share their parity, so for each parity the reachable sums
+    u1 + u2 + u3 are every second integer between two bounds.
+    """
+    lows = [max(low, -limit) for low in lows]
+    highs = [min(high, limit) for high in highs]
+    if any(low > high for low, high in zip(lows, highs)):
+        return False
+    for parity in (0, 1):
+        smallest = [low + (low - parity) % 2 for low in lows[1:]]
+        largest = [high - (high - parity) % 2 for high in highs[1:]]
+        if any(a > b for a, b in zip(smallest, largest)):
+            continue
+        low = max(lows[0], sum(smallest))
+        low += (low - parity) % 2
+        if low <= min(highs[0], sum(largest)):
+            return True
+    return False
+
+
+def deepest_overlap(lows, highs):
+    """Most of the intervals [lows, highs] that share a point."""
+    ends = np.sort(highs)
+    starts = np.sort(lows)
+    return int((np.arange(1, len(starts) + 1) - np.searchsorted(ends, starts, side="left")).max())
+
+
+def nearest_distance(lows, highs):
+    """Distance from the origin of the nearest grid point in a face-coordinate box, or None."""
+    low, high = 0, max(max(abs(v) for v in lows), max(abs(v) for v in highs))
+    if not has_point(lows, highs, high):
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        if has_point(lows, highs, middle):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
 def part_two(bots):
-    count = max_count = max_distance = 0
-    queue = PriorityQueue()
-
-    for x, y, z, radius in bots:
-        distance = abs(x) + abs(y) + abs(z)
-        # Add start of line segment to the queue
-        queue.put((max(0, distance - radius), 1))
-        # Add end of line segment to the queue
-        queue.put((distance + radius + 1, -1))
-
-    while not queue.empty():
-        distance, e = queue.get()
-        count += e
-        if count > max_count:
-            max_distance = distance
-            max_count = count
-
-    return max_distance
+    """
+    Branch and bound over boxes in face coordinates, split on the bots' own faces.
+
+    A box is scored by the most bots any of its points could be in range of:
+    the bots that reach into it, and no more of them than overlap at one
+    spot along every face normal. When no reaching bot has a face inside the
+    box, all of them hold the whole of it, so that score is exact for every
+    point there and the box's nearest point becomes the answer if it beats
+    the one so far. Otherwise the box is cut at a face inside it, so parallel
+    faces are told apart in one cut however close they are. A box is only
+    kept while it could still beat the answer: more bots, or as many but
+    nearer. The queue holds each box as a few numbers and the cut to make.
+
+    Boxes are popped best score first, then nearest the origin, so once the
+    first one cannot beat the answer none of the rest can either.
+    """
+    positions = np.array([bot[:3] for bot in bots], dtype=np.int64)
+    radii = np.array([bot[3] for bot in bots], dtype=np.int64)
+    # One row per face normal, one column per bot
+    centres = FACE_NORMALS @ positions.T
+    bot_lows, bot_highs = centres - radii, centres + radii
+
+    tie_breaker = count()
+    best_count, best_distance = 0, 0
+    queue = []
+
+    def beaten(bound, distance):
+        return bound < best_count or (bound == best_count and distance >= best_distance)
+
+    def consider(lows, highs, parent_bound):
+        """Settle the box, or queue it with the face it is to be cut at next."""
+        nonlocal best_count, best_distance
+        # Nearest the box could be, ignoring which of its points are on the grid
+        distance = max(max(low, -high, 0) for low, high in zip(lows, highs))
+        if beaten(parent_bound, distance):
+            return
+        overlap_lows = [np.maximum(bot_lows[k], lows[k]) for k in range(4)]
+        overlap_highs = [np.minimum(bot_highs[k], highs[k]) for k in range(4)]
+        reaches = overlap_lows[0] <= overlap_highs[1] + overlap_highs[2] + overlap_highs[3]
+        reaches &= overlap_lows[1] + overlap_lows[2] + overlap_lows[3] <= overlap_highs[0]
+        for k in range(4):
+            reaches &= overlap_lows[k] <= overlap_highs[k]
+        if not reaches.any():
+            return
+        # No point lies in more bots than the deepest pile-up along any one normal
+        bound = min(deepest_overlap(overlap_lows[k][reaches], overlap_highs[k][reaches]) for k in range(4))
+        if beaten(bound, distance):
+            return
+        # Faces of the reaching bots that fall strictly inside the box
+        cuts = []
+        for k in range(4):
+            faces_low, faces_high = bot_lows[k][reaches], bot_highs[k][reaches]
+            cuts.append(np.concatenate((faces_low[faces_low > lows[k]], faces_high[faces_high < highs[k]] + 1)))
+        if not any(len(faces) for faces in cuts):
+            distance = nearest_distance(lows, highs)
+            if distance is not None and not beaten(bound, distance):
+                best_count, best_distance = bound, distance
+            return
+        # Cut the widest way that has a face, at the median face for balance
+        axis = max((k for k in range(4) if len(cuts[k])), key=lambda k: highs[k] - lows[k])
+        faces = cuts[axis]
+        cut = int(np.partition(faces, len(faces) // 2)[len(faces) // 2])
+        heappush(queue, (-bound, distance, next(tie_breaker), lows, highs, axis, cut))
+
+    consider(tuple(bot_lows.min(axis=1).tolist()), tuple(bot_highs.max(axis=1).tolist()), len(bots))
+    while queue:
+        bound, distance, _, lows, highs, axis, cut = heappop(queue)
+        if beaten(-bound, distance):
+            break
+        consider(lows, highs[:axis] + (cut - 1,) + highs[axis + 1:], -bound)
+        consider(lows[:axis] + (cut,) + lows[axis + 1:], highs, -bound)
+    return best_distance
 
 
 if __name__ == "__main__":
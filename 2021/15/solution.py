@@ -1,8 +1,11 @@
 # Day 15: Chiton
 
-import heapq
+import sys
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from gridsearch import dijkstra as dijkstra_search, grid_steps, pad_grid
 
 
 def read_input_file(filepath: str = "input.txt") -> List[List[int]]:
@@ -18,28 +21,24 @@ def read_input_file(filepath: str = "input.txt") -> List[List[int]]:
 def dijkstra(grid: List[List[int]]) -> int:
     """
     Compute the lowest total risk from the top-left to bottom-right using Dijkstra's algorithm.
-    """
-    rows, cols = len(grid), len(grid[0])
-    start, end = (0, 0), (rows - 1, cols - 1)
-    
-    heap: List[Tuple[int, Tuple[int, int]]] = [(0, start)]
-    visited: Dict[Tuple[int, int], int] = {}
-
-    while heap:
-        risk, (x, y) = heapq.heappop(heap)
-        if (x, y) in visited:
-            continue
-        visited[(x, y)] = risk
 
-        if (x, y) == end:
-            return risk
+    Cells are addressed by flat index into a grid padded with a border of
+    zero-risk walls, and every step costs 1-9, so the search runs on a
+    Dial bucket queue instead of a binary heap.
+    """
+    # Risk 0 marks the padding walls, which are never entered
+    risks, width = pad_grid(grid)
+    start, end = width + 1, len(grid) * width + len(grid[0])
+    steps = grid_steps(width)
 
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < rows and 0 <= ny < cols and (nx, ny) not in visited:
-                heapq.heappush(heap, (risk + grid[nx][ny], (nx, ny)))
+    def neighbours(cell):
+        return [(cell + step, risks[cell + step]) for step in steps if risks[cell + step]]
 
-    raise ValueError("No path found")
+    costs, _, goal = dijkstra_search([(start, 0)], neighbours, len(risks),
+                                     is_goal=end.__eq__, max_step=9)
+    if goal is None:
+        raise ValueError("No path found")
+    return costs[goal]
 
 
 def expand_grid(grid: List[List[int]], times: int = 5) -> List[List[int]]:
@@ -47,16 +46,15 @@ def expand_grid(grid: List[List[int]], times: int = 5) -> List[List[int]]:
     Expand the grid according to Part 2 rules: tile it times x times,
     incrementing risk levels and wrapping at 9.
     """
-    original_rows, original_cols = len(grid), len(grid[0])
-    new_rows, new_cols = original_rows * times, original_cols * times
-    expanded: List[List[int]] = [[0] * new_cols for _ in range(new_rows)]
-
-    for i in range(new_rows):
-        for j in range(new_cols):
-            add_risk = i // original_rows + j // original_cols
-            expanded[i][j] = (grid[i % original_rows][j % original_cols] + add_risk - 1) % 9 + 1
+    # Every tile is the original shifted by (tile row + tile column) risk levels
+    wrapped = [[[(risk + add_risk - 1) % 9 + 1 for risk in row] for row in grid]
+               for add_risk in range(2 * times - 1)]
 
-    return expanded
+    return [
+        [risk for tile_x in range(times) for risk in wrapped[tile_y + tile_x][y]]
+        for tile_y in range(times)
+        for y in range(len(grid))
+    ]
 
 
 if __name__ == "__main__":
@@ -1,223 +1,202 @@
 # Day 18: Snailfish
 
-from functools import reduce
-from math import ceil
+from functools import partial, reduce
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import List, Tuple
 
-# Type alias for a snailfish number representation
-SnailfishToken = Union[int, str]
-SnailfishList = List[SnailfishToken]
+# A snailfish number is stored flat as its regular numbers from left to right,
+# alongside the depth of each one (how many pairs enclose it).
+# "[[1,2],3]" becomes values [1, 2, 3] and depths [2, 2, 1].
+SnailfishNumber = Tuple[List[int], List[int]]
 
+# Regular numbers nested deeper than this explode
+MAX_DEPTH = 4
 
-def read_input_file(filepath: str = "input.txt") -> List[SnailfishList]:
+
+def parse_snailfish(line: str) -> SnailfishNumber:
     """
-    Reads the input file and parses each line as a snailfish number.
-    
-    Converts each line from a string like "[1,2]" into a token list ['[', 1, ',', 2, ']']
+    Parses a string like "[[1,2],3]" into parallel value and depth lists.
     
     Args:
-        filepath: Path to the input file
+        line: Snailfish number in its bracketed text form
         
     Returns:
-        List of snailfish numbers, where each number is a list of tokens
+        Tuple of (values, depths)
     """
-    lines = Path(filepath).read_text().strip().splitlines()
-    snailfish_numbers = []
+    values: List[int] = []
+    depths: List[int] = []
+    depth = 0
+    current_number = ''
     
-    for line in lines:
-        tokens: SnailfishList = []
-        current_number = ''
-        
-        for char in line:
-            if char.isdigit():
-                current_number += char
-            else:
-                if current_number:
-                    tokens.append(int(current_number))
-                    current_number = ''
-                tokens.append(char)
-        
-        snailfish_numbers.append(tokens)
+    for char in line:
+        if char.isdigit():
+            current_number += char
+            continue
+        if current_number:
+            values.append(int(current_number))
+            depths.append(depth)
+            current_number = ''
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
     
-    return snailfish_numbers
+    return values, depths
 
 
-def snailfish_add(left: SnailfishList, right: SnailfishList) -> SnailfishList:
+def read_input_file(filepath: str = "input.txt") -> List[SnailfishNumber]:
     """
-    Adds two snailfish numbers and reduces the result.
+    Reads the input file and parses each line as a snailfish number.
     
     Args:
-        left: First snailfish number
-        right: Second snailfish number
+        filepath: Path to the input file
         
     Returns:
-        Reduced sum of the two numbers
+        List of snailfish numbers as (values, depths) tuples
     """
-    combined = ['['] + left + [','] + right + [']']
-    return snailfish_reduce(combined)
+    lines = Path(filepath).read_text().strip().splitlines()
+    return [parse_snailfish(line) for line in lines]
 
 
-def index_next_number_right(tokens: SnailfishList, start_index: int) -> Optional[int]:
+def snailfish_add(left: SnailfishNumber, right: SnailfishNumber) -> SnailfishNumber:
     """
-    Finds the index of the next integer to the right of the given position.
+    Adds two snailfish numbers and reduces the result.
     
-    Args:
-        tokens: List of snailfish tokens
-        start_index: Starting position to search from
-        
-    Returns:
-        Index of next integer, or None if not found
-    """
-    for index in range(start_index + 1, len(tokens)):
-        if isinstance(tokens[index], int):
-            return index
-    return None
-
-
-def index_next_number_left(tokens: SnailfishList, start_index: int) -> Optional[int]:
-    """
-    Finds the index of the next integer to the left of the given position.
+    Wrapping both in a new pair only deepens every regular number by one.
     
     Args:
-        tokens: List of snailfish tokens
-        start_index: Starting position to search from
+        left: First snailfish number
+        right: Second snailfish number
         
     Returns:
-        Index of next integer, or None if not found
+        Reduced sum of the two numbers
     """
-    for index in range(start_index - 1, -1, -1):
-        if isinstance(tokens[index], int):
-            return index
-    return None
+    values = left[0] + right[0]
+    depths = [depth + 1 for depth in left[1]]
+    depths.extend(depth + 1 for depth in right[1])
+    return snailfish_reduce(values, depths)
 
 
-def explode(tokens: SnailfishList) -> bool:
+def explode_all(values: List[int], depths: List[int]) -> SnailfishNumber:
     """
-    Attempts to explode a pair nested inside four pairs.
+    Explodes every pair nested inside four pairs in one left-to-right pass.
     
-    When a pair is nested inside four pairs, the leftmost such pair explodes.
-    The left value is added to the first number to the left (if any).
-    The right value is added to the first number to the right (if any).
-    The pair is replaced with 0.
+    The sum of two reduced numbers nests at most five deep, and exploding a
+    pair never makes another pair deeper, so handling them in order is the
+    same as repeatedly exploding the leftmost one.
     
     Args:
-        tokens: List of snailfish tokens (modified in place)
+        values: Regular numbers, left to right
+        depths: Depth of each regular number
         
     Returns:
-        True if an explosion occurred, False otherwise
-    """
-    depth = -1
-    
-    for i, token in enumerate(tokens):
-        if token == '[':
-            depth += 1
-        elif token == ']':
-            depth -= 1
-        elif token == ',':
-            continue
-        else:  # It's an integer
-            if depth == 4:
-                # Found a pair nested in 4 pairs
-                left_value_index = i
-                left_neighbor_index = index_next_number_left(tokens, i)
-                
-                right_value_index = index_next_number_right(tokens, i)
-                right_neighbor_index = index_next_number_right(tokens, right_value_index)
-                
-                # Add values to neighbors
-                if left_neighbor_index is not None:
-                    tokens[left_neighbor_index] += tokens[left_value_index]
-                if right_neighbor_index is not None:
-                    tokens[right_neighbor_index] += tokens[right_value_index]
-                
-                # Replace the pair with 0
-                tokens[left_value_index] = 0
-                del tokens[left_value_index + 1]  # Remove ','
-                del tokens[left_value_index + 1]  # Remove right value
-                del tokens[left_value_index + 1]  # Remove ']'
-                del tokens[left_value_index - 1]  # Remove '['
-                
-                return True
-    
-    return False
-
-
-def split(tokens: SnailfishList) -> bool:
+        Tuple of (values, depths) with no pair deeper than four
     """
-    Attempts to split a number >= 10 into a pair.
+    new_values: List[int] = []
+    new_depths: List[int] = []
+    carry = 0  # Right half of the last exploded pair, added to the next number
+    i = 0
     
-    Replaces the first number >= 10 with [n//2, ceil(n/2)].
+    while i < len(values):
+        depth = depths[i]
+        if depth > MAX_DEPTH:
+            if new_values:
+                new_values[-1] += values[i] + carry
+            carry = values[i + 1]
+            new_values.append(0)
+            new_depths.append(depth - 1)
+            i += 2
+        else:
+            new_values.append(values[i] + carry)
+            new_depths.append(depth)
+            carry = 0
+            i += 1
     
-    Args:
-        tokens: List of snailfish tokens (modified in place)
-        
-    Returns:
-        True if a split occurred, False otherwise
-    """
-    for i, token in enumerate(tokens):
-        if isinstance(token, int) and token >= 10:
-            # Split the number into a pair
-            del tokens[i]
-            tokens.insert(i, '[')
-            tokens.insert(i + 1, token // 2)
-            tokens.insert(i + 2, ',')
-            tokens.insert(i + 3, ceil(token / 2))
-            tokens.insert(i + 4, ']')
-            return True
-    
-    return False
+    return new_values, new_depths
 
 
-def snailfish_reduce(tokens: SnailfishList) -> SnailfishList:
+def split_all(values: List[int], depths: List[int]) -> SnailfishNumber:
     """
-    Reduces a snailfish number by repeatedly exploding and splitting.
+    Applies every split (and the explosions they cause) in a single pass.
+    
+    Everything left of the cursor is already below 10. A split at depth four
+    creates a pair that explodes at once, which may push the number just left
+    of the cursor to 10 or more; that is then the leftmost split, so the
+    cursor steps back by one. Otherwise the cursor only moves right.
     
     Args:
-        tokens: List of snailfish tokens (modified in place)
+        values: Regular numbers with no pair deeper than four (modified in place)
+        depths: Depth of each regular number (modified in place)
         
     Returns:
-        The reduced snailfish number
+        The fully reduced (values, depths)
     """
-    while True:
-        if explode(tokens):
+    i = 0
+    
+    while i < len(values):
+        value = values[i]
+        if value < 10:
+            i += 1
             continue
-        if split(tokens):
+        
+        low, high = value // 2, (value + 1) // 2
+        depth = depths[i]
+        if depth < MAX_DEPTH:
+            # Plain split into a pair one level deeper
+            values[i:i + 1] = [low, high]
+            depths[i:i + 1] = [depth + 1, depth + 1]
             continue
-        break
+        
+        # The new pair would be nested five deep: explode it immediately
+        values[i] = 0
+        if i + 1 < len(values):
+            values[i + 1] += high
+        if i > 0:
+            values[i - 1] += low
+            if values[i - 1] >= 10:
+                i -= 1
     
-    return tokens
+    return values, depths
 
 
-def get_magnitude_impl(value: Union[int, List]) -> int:
+def snailfish_reduce(values: List[int], depths: List[int]) -> SnailfishNumber:
     """
-    Recursively calculates the magnitude of a snailfish number.
+    Reduces a snailfish number by exploding and then splitting.
     
     Args:
-        value: Either an integer or a list [left, right]
+        values: Regular numbers, left to right
+        depths: Depth of each regular number
         
     Returns:
-        The magnitude as an integer
+        The reduced snailfish number
     """
-    if isinstance(value, int):
-        return value
-    return 3 * get_magnitude_impl(value[0]) + 2 * get_magnitude_impl(value[1])
+    return split_all(*explode_all(values, depths))
 
 
-def get_magnitude(tokens: SnailfishList) -> int:
+def get_magnitude(number: SnailfishNumber) -> int:
     """
     Calculates the magnitude of a snailfish number.
     
-    Converts the token list back to a nested list structure and calculates magnitude.
+    Regular numbers are pushed on a stack; whenever the top two share a depth
+    they are the two halves of one pair and collapse into 3 * left + 2 * right.
     
     Args:
-        tokens: List of snailfish tokens
+        number: Snailfish number as (values, depths)
         
     Returns:
         The magnitude of the snailfish number
     """
-    nested_list = eval(''.join(str(token) for token in tokens))
-    return get_magnitude_impl(nested_list)
+    stack: List[Tuple[int, int]] = []
+    
+    for value, depth in zip(*number):
+        while stack and stack[-1][1] == depth:
+            left, _ = stack.pop()
+            value = 3 * left + 2 * value
+            depth -= 1
+        stack.append((value, depth))
+    
+    return stack[0][0]
 
 
 def part_one(snailfish_numbers):
@@ -226,17 +205,28 @@ def part_one(snailfish_numbers):
 
     return get_magnitude(final_sum)
 
+
+def largest_magnitude_from(snailfish_numbers, left_indexes):
+    """Largest magnitude of left + right over the given left numbers and every other right."""
+    return max(
+        get_magnitude(snailfish_add(snailfish_numbers[i], right))
+        for i in left_indexes
+        for j, right in enumerate(snailfish_numbers)
+        if i != j
+    )
+
     
-def part_two(snailfish_numbers):
+def part_two(snailfish_numbers, num_processes=None):
     """Part 2: Find largest magnitude from adding any two different numbers"""
-    largest_magnitude = max(
-        get_magnitude(snailfish_add(left, right))
-        for left in snailfish_numbers
-        for right in snailfish_numbers
-        if left != right
-    )
+    count = len(snailfish_numbers)
+    workers = num_processes or cpu_count()
+    chunks = [range(start, count, workers) for start in range(min(workers, count))]
+    
+    # Each chunk handles a slice of the left-hand numbers in its own process
+    with Pool(processes=workers) as pool:
+        results = pool.map(partial(largest_magnitude_from, snailfish_numbers), chunks)
     
-    return largest_magnitude
+    return max(results)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 # Day 17: Pyroclastic Flow
 
+import sys
 from collections import defaultdict
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from cycles import extrapolate_in_place
+
 # Rock shapes (4x4 grid, top-left anchored)
 SHAPES = [
     [[1, 0, 0, 0],
@@ -48,6 +52,8 @@ class PyroclasticSimulator:
         self.grid = defaultdict(int)      # (x,y) -> 1 if filled
         self.pid = 0                      # current piece id (index into PIECES)
         self.max_y = -1                   # highest occupied y; -1 means empty floor
+        self.column_tops = [-17] * 7      # highest occupied y of each column
+        self.jet_index = 0                # next jet of the pattern to push
         # px is horizontal position (left-most column of the piece's 4x4); initial = 2
         self.px = 2
         # IMPORTANT FIX: initialize py using rule used for subsequent spawns.
@@ -83,6 +89,8 @@ class PyroclasticSimulator:
                 if piece[i][j]:
                     rx, ry = self.px + i, self.py - j
                     self.grid[(rx, ry)] = 1
+                    self.column_tops[rx] = max(self.column_tops[rx], ry)
+                    self.max_y = max(self.max_y, ry)
 
     def _move_down(self) -> bool:
         """Try moving the piece down; lock it if it cannot move."""
@@ -93,66 +101,39 @@ class PyroclasticSimulator:
 
     def _top_profile(self) -> tuple:
         """Return a normalized profile of the top of the tower (7 ints)."""
-        heights = [-17] * 7
-        for (x, y), v in self.grid.items():
-            if v == 1:
-                heights[x] = max(heights[x], y)
-        top = max(heights)
-        return tuple(h - top for h in heights)
+        top = max(self.column_tops)
+        return tuple(h - top for h in self.column_tops)
 
     def _spawn_new_piece(self):
-        """Prepare for the next piece after one locks (update pid, px, py, max_y)."""
-        self.max_y = max((y for (_, y), v in self.grid.items() if v == 1), default=-1)
+        """Prepare for the next piece after one locks (update pid, px, py)."""
         self.pid = (self.pid + 1) % len(SHAPES)
         self.px = 2
         self.py = self.max_y + 3 + 4 - HEIGHTS[self.pid]
 
+    def drop_piece(self) -> "PyroclasticSimulator":
+        """Push and drop the current piece until it locks, then spawn the next one."""
+        jets = self.jet_pattern
+        while True:
+            jet = jets[self.jet_index]
+            self.jet_index = (self.jet_index + 1) % len(jets)
+            self._move_piece(-1 if jet == "<" else 1, 0)
+            if not self._move_down():
+                self._spawn_new_piece()
+                return self
+
     def simulate(self, target_pieces: int, use_cycle_detection: bool = False) -> int:
         """
-        Run the simulation up to the target number of pieces.
-        If use_cycle_detection is True, attempts to fast-forward using detected cycles.
+        Run the simulation up to the target number of pieces and return the tower height.
+        If use_cycle_detection is True, fast-forwards over the period of (top profile,
+        next piece, next jet) once it is found.
         """
-        seen = {}
-        num_pieces = 0
-        extra_height = 0
-        jets = self.jet_pattern
-
-        while num_pieces < target_pieces:
-            for vid, jet in enumerate(jets):
-                # apply jet push
-                if jet == "<":
-                    self._move_piece(-1, 0)
-                else:
-                    self._move_piece(1, 0)
-
-                # try to move down; if can't, piece locks
-                if not self._move_down():
-                    # spawn next piece
-                    self._spawn_new_piece()
-                    num_pieces += 1
-
-                    if num_pieces >= target_pieces:
-                        break
-
-                    if use_cycle_detection:
-                        key = (self._top_profile(), self.pid, vid)
-                        if key in seen:
-                            old_num, old_max = seen[key]
-                            delta_n = num_pieces - old_num
-                            delta_h = self.max_y - old_max
-                            # how many full repeats can we take
-                            repeats = (target_pieces - num_pieces) // delta_n
-                            num_pieces += delta_n * repeats
-                            extra_height += delta_h * repeats
-                            seen.clear()  # avoid repeating the same fast-forward
-                        else:
-                            seen[key] = (num_pieces, self.max_y)
-
-            if num_pieces >= target_pieces:
-                break
-
-        final_height = max((y for (_, y), v in self.grid.items() if v == 1), default=-1)
-        return final_height + 1 + extra_height
+        if use_cycle_detection:
+            return extrapolate_in_place(PyroclasticSimulator.drop_piece, self, target_pieces,
+                                        metric=lambda sim: sim.max_y + 1,
+                                        key=lambda sim: (sim._top_profile(), sim.pid, sim.jet_index))
+        for _ in range(target_pieces):
+            self.drop_piece()
+        return self.max_y + 1
 
 
 if __name__ == "__main__":
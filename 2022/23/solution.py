@@ -1,23 +1,13 @@
 # Day 23: Unstable Diffusion
 
-from collections import defaultdict
-from typing import Set, Tuple, Dict, List, Optional
+from time import perf_counter
+from typing import Set, Tuple, List, Optional
 
-# 8 neighbor offsets
-NEIGHBORS = [(-1, -1), (-1, 0), (-1, 1),
-             (0, -1),           (0, 1),
-             (1, -1),  (1, 0),  (1, 1)]
+# Empty columns kept to the right of bit 0, so westward moves never fall off.
+COLUMN_MARGIN = 16
 
 # Directions in the order North, South, West, East for proposals.
-# Each entry is (move_delta, list_of_checks)
-# move_delta is the resulting move if that direction is chosen.
-# list_of_checks are relative offsets that must all be empty to allow that move.
-DIRS = [
-    ((-1, 0), [(-1, -1), (-1, 0), (-1, 1)]),  # North
-    ((1, 0),  [(1, -1),  (1, 0),  (1, 1)]),   # South
-    ((0, -1), [(-1, -1), (0, -1), (1, -1)]),  # West
-    ((0, 1),  [(-1, 1),  (0, 1),  (1, 1)]),   # East
-]
+NORTH, SOUTH, WEST, EAST = range(4)
 
 
 def read_input_file(filename: str = "input.txt") -> Set[Tuple[int, int]]:
@@ -34,6 +24,101 @@ def read_input_file(filename: str = "input.txt") -> Set[Tuple[int, int]]:
     return elves
 
 
+class ElfBoard:
+    """
+    The elves as one Python int per row, bit c set when column c holds an elf.
+
+    Rows are kept with an empty row above and below and COLUMN_MARGIN empty
+    low bits, so the board grows freely in every direction as elves spread.
+    `top` and `left` record the coordinates of row 0 / bit 0.
+    """
+
+    def __init__(self, elves: Set[Tuple[int, int]]):
+        self.top = min((r for r, _ in elves), default=0) - 1
+        self.left = min((c for _, c in elves), default=0) - COLUMN_MARGIN
+        height = max((r for r, _ in elves), default=0) - self.top + 2
+        self.rows = [0] * height
+        for r, c in elves:
+            self.rows[r - self.top] |= 1 << (c - self.left)
+
+    def positions(self) -> Set[Tuple[int, int]]:
+        elves = set()
+        for i, row in enumerate(self.rows):
+            c = 0
+            while row:
+                if row & 1:
+                    elves.add((i + self.top, c + self.left))
+                row >>= 1
+                c += 1
+        return elves
+
+    def _make_room(self):
+        rows = self.rows
+        if rows[0]:
+            rows.insert(0, 0)
+            self.top -= 1
+        if rows[-1]:
+            rows.append(0)
+        if any(row & 1 for row in rows):
+            self.rows = [row << COLUMN_MARGIN for row in rows]
+            self.left -= COLUMN_MARGIN
+
+    def step(self, first_direction: int) -> bool:
+        """Play one round with proposals starting at `first_direction`; return True if any elf moved."""
+        self._make_room()
+        rows = self.rows
+        height = len(rows)
+        proposals = [[0] * height for _ in range(4)]
+
+        for i in range(1, height - 1):
+            row = rows[i]
+            if not row:
+                continue
+            above, below = rows[i - 1], rows[i + 1]
+            # Occupied cells to the N / S including the diagonals
+            north = above | (above << 1) | (above >> 1)
+            south = below | (below << 1) | (below >> 1)
+            # Occupied cells in the column W / E of each bit, across three rows
+            column = above | row | below
+            west, east = column << 1, column >> 1
+
+            # Elves with no neighbour at all stay put
+            remaining = row & (north | south | west | east)
+            blocked = (north, south, west, east)
+            for k in range(4):
+                direction = (first_direction + k) & 3
+                chosen = remaining & ~blocked[direction]
+                proposals[direction][i] = chosen
+                remaining &= ~chosen
+
+        north_moves, south_moves, west_moves, east_moves = proposals
+        # Only elves facing each other can target the same tile: cancel both
+        for i in range(1, height - 1):
+            clash = north_moves[i + 1] & south_moves[i - 1]
+            if clash:
+                north_moves[i + 1] &= ~clash
+                south_moves[i - 1] &= ~clash
+            clash = (west_moves[i] >> 1) & (east_moves[i] << 1)
+            if clash:
+                west_moves[i] &= ~(clash << 1)
+                east_moves[i] &= ~(clash >> 1)
+
+        moved = False
+        new_rows = [0] * height
+        for i in range(height):
+            leaving = north_moves[i] | south_moves[i] | west_moves[i] | east_moves[i]
+            if leaving:
+                moved = True
+            row = (rows[i] & ~leaving) | (west_moves[i] >> 1) | (east_moves[i] << 1)
+            if i + 1 < height:
+                row |= north_moves[i + 1]
+            if i > 0:
+                row |= south_moves[i - 1]
+            new_rows[i] = row
+        self.rows = new_rows
+        return moved
+
+
 def bounding_area(elves: Set[Tuple[int, int]]) -> int:
     """Return the number of empty ground tiles in the bounding rectangle."""
     if not elves:
@@ -46,74 +131,28 @@ def bounding_area(elves: Set[Tuple[int, int]]) -> int:
     return area - len(elves)
 
 
-def simulate(elves: Set[Tuple[int, int]], rounds: Optional[int] = None) -> Tuple[Set[Tuple[int, int]], int]:
+def simulate(elves: Set[Tuple[int, int]], rounds: Optional[int] = None,
+             round_times: Optional[List[float]] = None) -> Tuple[Set[Tuple[int, int]], int]:
     """
     Simulate movement.
     - If rounds is an int: perform exactly that many rounds and return (elves_after, rounds_done).
     - If rounds is None: run until a round happens with no movement and return (final_elves, round_index_of_stop).
       round_index_of_stop is 1-based.
+    - If round_times is a list, the duration in seconds of every round is appended to it.
     """
-    elves = set(elves)  # copy so original set is not mutated
-    start_dir = 0  # index into DIRS for the priority in the first round
+    board = ElfBoard(elves)
     round_idx = 0
 
-    while True:
+    while rounds is None or round_idx < rounds:
+        started = perf_counter()
+        moved = board.step(round_idx % 4)
         round_idx += 1
-        proposals: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
-
-        # Phase 1: each elf proposes (or not)
-        for (r, c) in elves:
-            # if there are no neighbors, do not propose
-            if all((r + dr, c + dc) not in elves for dr, dc in NEIGHBORS):
-                continue
-
-            # try directions in order starting at start_dir
-            moved = False
-            for k in range(4):
-                dir_idx = (start_dir + k) % 4
-                move_delta, checks = DIRS[dir_idx]
-                if all((r + dr, c + dc) not in elves for dr, dc in checks):
-                    # propose
-                    nr, nc = r + move_delta[0], c + move_delta[1]
-                    proposals[(nr, nc)].append((r, c))
-                    moved = True
-                    break
-            # if no valid direction found -> no proposal
-
-        # Phase 2: resolve proposals
-        if not proposals:
-            # no one proposed -> no movement this round
-            # if we were asked exactly N rounds, this may be earlier than N
-            if rounds is None:
-                return elves, round_idx  # stopped at this round (1-based)
-            else:
-                # No proposals but we still need to continue (remaining rounds do nothing)
-                start_dir = (start_dir + 1) % 4
-                if round_idx >= rounds:
-                    return elves, round_idx
-                continue
-
-        moved = False
-        new_elves = set(elves)
-        for target, proposers in proposals.items():
-            if len(proposers) == 1:
-                # move accepted
-                mover = proposers[0]
-                new_elves.remove(mover)
-                new_elves.add(target)
-                moved = True
-            # otherwise blocked - no one moves to that target
-
-        elves = new_elves
-        start_dir = (start_dir + 1) % 4
-
-        # If user wanted exactly 'rounds' rounds, stop when reached
-        if rounds is not None and round_idx >= rounds:
-            return elves, round_idx
+        if round_times is not None:
+            round_times.append(perf_counter() - started)
+        if rounds is None and not moved:
+            break
 
-        # If nobody moved this round -> finished
-        if not moved:
-            return elves, round_idx  # round_idx is the first round with no movement
+    return board.positions(), round_idx
 
 
 if __name__ == "__main__":
@@ -124,7 +163,9 @@ if __name__ == "__main__":
     p1 = bounding_area(elves_after_10)
 
     # Part 2: run until no movement and return the round index (1-based)
-    _, p2 = simulate(elves, rounds=None)
+    timings: List[float] = []
+    _, p2 = simulate(elves, rounds=None, round_times=timings)
 
     print("Part 1:", p1)
     print("Part 2:", p2)
+    print(f"Average round: {sum(timings) / len(timings) * 1e3:.3f} ms over {len(timings)} rounds")
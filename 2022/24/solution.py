@@ -1,4 +1,3 @@
-
 def read_input_file(filename="input.txt"):
     grid = []
 
@@ -33,105 +32,103 @@ def read_input_file(filename="input.txt"):
 
 
 # 0b1 = up, 0b10 = right, 0b100 = down, 0b1000 = left
-def print_state(grid, state):
-    for r, line in enumerate(grid):
-        row = []
-        for c, point in enumerate(line):
-            if point == 0b1:
-                row.append('^')
-            elif point == 0b10:
-                row.append('>')
-            elif point == 0b100:
-                row.append('v')
-            elif point == 0b1000:
-                row.append('<')
-            elif point in (0b0011, 0b0101, 0b1001, 0b0110, 0b1010, 0b1100):
-                row.append('2')
-            elif point in (0b0111, 0b1011, 0b1101, 0b1110):
-                row.append('3')
-            elif point == 0b1111:
-                row.append('4')
-            elif point == 0:
-                row.append('@' if state[r][c] else ' ')
-            else:
-                row.append('?')
-        print(''.join(row))
-
-
-def wrap(k, n):
-    return k % n
-
-
-def advance(grid, swap):
-    n, m = len(grid), len(grid[0])
-    for r in range(n):
-        for c in range(m):
-            up    = grid[wrap(r+1, n)][c] & 0b1
-            down  = grid[wrap(r-1, n)][c] & 0b100
-            left  = grid[r][wrap(c+1, m)] & 0b1000
-            right = grid[r][wrap(c-1, m)] & 0b10
-
-            swap[r][c] = up | down | left | right
-    # swap references
-    grid[:], swap[:] = swap[:], grid[:]
+class Blizzards:
+    """
+    The blizzards of the valley as one bitset per row and direction.
+
+    Bit c of a row bitset marks column c. Blizzards never change row or column,
+    so their position at minute t is a pure rotation of the starting layout:
+    '>' and '<' rotate the row bitset by t, while '^' and 'v' pick the starting
+    bitset of the row t steps below or above. Nothing is rebuilt per minute.
+    """
+
+    def __init__(self, grid):
+        self.n, self.m = len(grid), len(grid[0])
+        self.full = (1 << self.m) - 1
+
+        def bitset(line, kind):
+            return sum(1 << c for c, point in enumerate(line) if point & kind)
+
+        self.up = [bitset(line, 0b1) for line in grid]
+        self.right = [bitset(line, 0b10) for line in grid]
+        self.down = [bitset(line, 0b100) for line in grid]
+        self.left = [bitset(line, 0b1000) for line in grid]
+
+    def free(self, r, t):
+        """Bitset of the columns in row r that are clear of blizzards at minute t."""
+        n, m, full = self.n, self.m, self.full
+        k = t % m
+        right = self.right[r]
+        left = self.left[r]
+        occupied = (
+            ((right << k) | (right >> (m - k)))
+            | (left >> k) | (left << (m - k))
+            | self.down[(r - t) % n]
+            | self.up[(r + t) % n]
+        )
+        return ~occupied & full
+
+
+def print_state(blizzards, t, state):
+    """Draw the valley at minute t with '#' for blizzards and '@' for the frontier."""
+    for r in range(blizzards.n):
+        free = blizzards.free(r, t)
+        print(''.join(
+            '#' if not free >> c & 1 else '@' if state[r] >> c & 1 else ' '
+            for c in range(blizzards.m)
+        ))
 
 
 def iterate(grid, goals):
-    n, m = len(grid), len(grid[0])
-    swapgrid = [[0] * m for _ in range(n)]
+    """
+    Walk the valley through every goal in turn, starting at the first one.
 
-    state = [[False] * m for _ in range(n)]
-    swapstate = [[False] * m for _ in range(n)]
+    The set of cells the expedition could be in is kept as one bitset per row.
+    Each minute it spreads to the four neighbours with shifts and is masked by
+    the free cells of that minute. Goals are the interior cells next to the
+    entrance and exit, one extra minute is spent stepping out onto them.
 
-    n_i, m_i = n, m
+    Returns:
+        list: The minute at which each leg finishes.
+    """
+    blizzards = Blizzards(grid)
+    n, full = blizzards.n, blizzards.full
 
     iterations = 0
+    arrivals = []
     goals_iter = iter(goals)
     start_r, start_c = next(goals_iter)
 
-    first_goal_met = False
-
     for goal_r, goal_c in goals_iter:
-        # clear state
-        for line in state:
-            for i in range(m):
-                line[i] = False
-
-        while True:
-            advance(grid, swapgrid)
-
-            for r in range(n_i):
-                for c in range(m_i):
-                    empty = grid[r][c] == 0
-                    reachable = (
-                        state[r][c]
-                        or (r >= 1 and state[r-1][c])
-                        or (r+1 < n_i and state[r+1][c])
-                        or (c >= 1 and state[r][c-1])
-                        or (c+1 < m_i and state[r][c+1])
-                    )
-                    swapstate[r][c] = empty and reachable
-
-            swapstate[start_r][start_c] = (grid[start_r][start_c] == 0)
-
-            state, swapstate = swapstate, state
-            iterations += 1
+        state = [0] * n
+        start_bit, goal_bit = 1 << start_c, 1 << goal_c
 
-            if state[goal_r][goal_c]:
-                break
+        while not state[goal_r] & goal_bit:
+            iterations += 1
+            spread = [0] * n
+            for r in range(n):
+                row = state[r]
+                reach = row | (row << 1) | (row >> 1)
+                if r >= 1:
+                    reach |= state[r - 1]
+                if r + 1 < n:
+                    reach |= state[r + 1]
+                if reach:
+                    spread[r] = reach & full & blizzards.free(r, iterations)
+            # The expedition can always step in from the waiting spot
+            spread[start_r] |= start_bit & blizzards.free(start_r, iterations)
+            state = spread
 
-        advance(grid, swapgrid)
         iterations += 1
-
+        arrivals.append(iterations)
         start_r, start_c = goal_r, goal_c
-        if not first_goal_met:
-            print("Part 1:", iterations)
-            first_goal_met = True
 
-    print("Part 2:", iterations)
+    return arrivals
 
 
 if __name__ == "__main__":
     valley = read_input_file()
     n, m = len(valley), len(valley[0])
-    iterate(valley, [(0, 0), (n-1, m-1), (0, 0), (n-1, m-1)])
+    legs = iterate(valley, [(0, 0), (n-1, m-1), (0, 0), (n-1, m-1)])
+    print("Part 1:", legs[0])
+    print("Part 2:", legs[-1])
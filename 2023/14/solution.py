@@ -1,4 +1,9 @@
-from itertools import count, product
+import sys
+from itertools import product
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from cycles import extrapolate_in_place
 
 
 def read_input_file():
@@ -35,29 +40,8 @@ def stringify_state(state):
     return "".join(sum(state, []))
 
 
-def find_cycle(initial_state):
-    cycle_cache = {stringify_state(initial_state): 0}
-    state = initial_state
-    for iteration in count(1):
-        state = cycle_state(state)
-        state_string = stringify_state(state)
-        if state_string in cycle_cache:
-            first_occurrence = cycle_cache[state_string]
-            # return the first occurrence in cycle, cycle period length and cycle cache
-            return first_occurrence, iteration - first_occurrence, cycle_cache
-        cycle_cache[state_string] = iteration
-
-
 def part_two(initial_state, cycles):
-    # find the period of the rotation cycle
-    first, period, cache = find_cycle(initial_state)
-    # swap keys and values of cache to create a lookup
-    lookup = {first_occurrence: state_string for state_string, first_occurrence in cache.items()}
-    # use the cycle period to find the state
-    state_string = lookup[(first + (cycles - first) % period)]
-    # return the state to a usable format
-    state = list(zip(*[iter(state_string)] * len(initial_state[0])))
-    return compute_load(state)
+    return extrapolate_in_place(cycle_state, initial_state, cycles, compute_load, key=stringify_state)
 
 
 if __name__ == "__main__":
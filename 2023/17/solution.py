@@ -1,80 +1,77 @@
-from queue import PriorityQueue
+import sys
+from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from gridsearch import HEADINGS, dijkstra, grid_steps, pad_grid
 
-class CrucibleState:
-    def __init__(self, cost, position, direction, streak):
-        self.cost = cost
-        self.position = position
-        self.direction = direction
-        self.streak = streak
-        self.key = (position, direction, streak)
 
-    def __lt__(self, another):
-        return (self.cost, self.streak) < (another.cost, another.streak)
+def read_input_file():
+    """Heat losses as a flat list padded with a border of 0 (off the map) cells."""
+    rows = [[int(loss) for loss in row] for row in open('input.txt').read().splitlines()]
+    return pad_grid(rows)
 
-    def as_tuple(self):
-        return self.cost, self.position, self.direction, self.streak
 
+def crucible_search(grid, width, end_point, min_streak, max_streak):
+    """Least heat loss from the top-left block to `end_point`.
 
-def read_input_file():
-    return {x + y * 1j: int(loss)
-            for y, row in enumerate(open('input.txt').read().splitlines())
-            for x, loss in enumerate(row)}
-
-
-def part_one(grid, end_point, max_streak):
-    visited = set()  # (position, direction, streak)
-    pq = PriorityQueue()  # (cost, position, direction, streak)
-    pq.put(CrucibleState(grid[0 + 1j], 1j, 1j, 1))
-    pq.put(CrucibleState(grid[1 + 0j], 1, 1, 1))
-    while not pq.empty():
-        crucible = pq.get()
-        if crucible.key in visited:
-            continue
-        visited.add(crucible.key)
-        cost, position, direction, streak = crucible.as_tuple()
-        if position == end_point and streak <= max_streak:
-            return crucible.cost
-        if streak < max_streak and (new_position := position + direction) in grid:
-            pq.put(CrucibleState(cost + grid[new_position], new_position, direction, streak + 1))
-        for change in (1j, -1):
-            direction *= change
-            if (new_position := position + direction) in grid:
-                pq.put(CrucibleState(cost + grid[new_position], new_position, direction, 1))
-
-
-def part_two(grid, end_point, min_streak, max_streak):
-    visited = set()  # (position, direction, streak)
-    pq = PriorityQueue()  # (cost, position, direction, streak)
-    pq.put(CrucibleState(grid[0 + 1j], 1j, 1j, 1))
-    pq.put(CrucibleState(grid[1 + 0j], 1, 1, 1))
-    while not pq.empty():
-        crucible = pq.get()
-        if crucible.key in visited:
-            continue
-        visited.add(crucible.key)
-        cost, position, direction, streak = crucible.as_tuple()
-        if position == end_point and streak <= max_streak:
-            return crucible.cost
-        if streak < max_streak and (new_position := position + direction) in grid:
-            pq.put(CrucibleState(cost + grid[new_position], new_position, direction, streak + 1))
-        for change in (1j, -1):
-            direction *= change
-            if min_streak <= streak and (new_position := position + direction) in grid:
-                pq.put(CrucibleState(cost + grid[new_position], new_position, direction, 1))
+    A search state (position, heading, streak) is packed into one int,
+    ((position * 4) + heading) * (max_streak + 1) + streak. Heat loss per
+    block is 1-9, so the search runs on a Dial bucket queue.
+    """
+    steps = grid_steps(width)
+    streaks = max_streak + 1
+
+    def pack(position, heading, streak):
+        return (position * HEADINGS + heading) * streaks + streak
+
+    def neighbours(state):
+        cell, streak = divmod(state, streaks)
+        position, heading = divmod(cell, HEADINGS)
+        moves = []
+        if streak < max_streak:
+            new_position = position + steps[heading]
+            if grid[new_position]:
+                moves.append((pack(new_position, heading, streak + 1), grid[new_position]))
+        if min_streak <= streak:
+            for new_heading in ((heading + 1) % HEADINGS, (heading - 1) % HEADINGS):
+                new_position = position + steps[new_heading]
+                if grid[new_position]:
+                    moves.append((pack(new_position, new_heading, 1), grid[new_position]))
+        return moves
+
+    def is_goal(state):
+        cell, streak = divmod(state, streaks)
+        return cell // HEADINGS == end_point and min_streak <= streak
+
+    starts = []
+    for heading in (0, 1):
+        position = width + 1 + steps[heading]
+        if grid[position]:
+            starts.append((pack(position, heading, 1), grid[position]))
+
+    costs, _, goal = dijkstra(starts, neighbours, len(grid) * HEADINGS * streaks,
+                              is_goal=is_goal, max_step=9)
+    return costs[goal]
+
+
+def part_one(grid, width, end_point, max_streak):
+    return crucible_search(grid, width, end_point, 1, max_streak)
+
+
+def part_two(grid, width, end_point, min_streak, max_streak):
+    return crucible_search(grid, width, end_point, min_streak, max_streak)
 
 
 if __name__ in "__main__":
     from time import time
-    from math import sqrt
 
-    heat_loss_grid = read_input_file()
-    grid_length = int(sqrt(len(heat_loss_grid)))
-    destination = (grid_length - 1) + (grid_length - 1) * 1j
+    heat_loss_grid, grid_width = read_input_file()
+    # Bottom-right block, just inside the padding border
+    destination = len(heat_loss_grid) - grid_width - 2
 
     st = time()
-    p1 = part_one(heat_loss_grid, destination, 3)
-    p2 = part_two(heat_loss_grid, destination, 4, 10)
+    p1 = part_one(heat_loss_grid, grid_width, destination, 3)
+    p2 = part_two(heat_loss_grid, grid_width, destination, 4, 10)
     print(f"Execution Time: {time() - st} seconds.")
     print(f"Part 1: {p1}")
     print(f"Part 2: {p2}")
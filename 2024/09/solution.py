@@ -3,10 +3,11 @@ Advent of Code 2024
 Day 9: Disk Fragmenter
 https://adventofcode.com/2024/day/9
 """
-from collections import deque
-from dataclasses import dataclass
+import heapq
 from time import perf_counter as measure_time
 
+import numpy as np
+
 def performance_profiler(method):
     """
     A decorator that measures and prints the execution time of a method.
@@ -28,48 +29,18 @@ def performance_profiler(method):
     return timing_wrapper
 
 
-@dataclass
-class File:
-    """
-    Represents a file on the disk with its unique identifier, size, and position.
-    
-    Attributes:
-        id (int): Unique identifier for the file
-        size (int): Size of the file in blocks
-        position (int): Starting position of the file on the disk
-    """
-    id: int
-    size: int
-    position: int
-
-
-@dataclass
-class FreeSpace:
-    """
-    Represents a free space block on the disk.
-    
-    Attributes:
-        position (int): Starting position of the free space
-        size (int): Size of the free space in blocks
-    """
-    position: int
-    size: int
-
-
 @performance_profiler
 def part_one(parsed_input):
     """
     Compact the disk by moving blocks, prioritizing non-None (file) blocks.
     
     Args:
-        parsed_input (tuple): Tuple containing files, free spaces, and disk state
+        parsed_input (tuple): File and free space positions and sizes
     
     Returns:
         int: Checksum of the compacted disk
     """
-    files, free_spaces, disk = parsed_input
-    compacted = compact_disk_blocks(disk)
-    return compute_checksum(compacted)
+    return compact_disk_blocks(*parsed_input)
 
 
 @performance_profiler
@@ -78,14 +49,12 @@ def part_two(parsed_input):
     Compact the disk by moving whole files to free spaces.
     
     Args:
-        parsed_input (tuple): Tuple containing files, free spaces, and disk state
+        parsed_input (tuple): File and free space positions and sizes
     
     Returns:
         int: Checksum of the compacted disk
     """
-    files, free_spaces, disk = parsed_input
-    compacted = compact_disk_files(files, free_spaces, len(disk))
-    return compute_checksum(compacted)
+    return compact_disk_files(*parsed_input)
 
 
 def parse_input(file_path):
@@ -99,132 +68,152 @@ def parse_input(file_path):
         file_path (str): Path to the input file
 
     Returns:
-        Tuple of (files, free_spaces, initial_disk) where:
-        - files: List of File objects
-        - free_spaces: List of FreeSpace objects
-        - initial_disk: List representing initial disk state
+        Tuple of (file_positions, file_sizes, free_positions, free_sizes),
+        flat int64 arrays; a file's ID is its index in the file arrays
     """
-    with open(file_path, "r") as f:
-        input_content = f.read().strip()
-
-    files = []
-    free_spaces = []
-    disk = []
-    pos = 0
-    file_id = 0
+    with open(file_path, "rb") as f:
+        lengths = np.frombuffer(f.read().strip(), dtype=np.uint8).astype(np.int64) - ord("0")
 
-    # Parse alternating file and space lengths
-    for i, length in enumerate(map(int, input_content)):
-        length = int(length)
-        if i % 2 == 0:  # File
-            # Create a File object and fill disk with file ID
-            files.append(File(file_id, length, pos))
-            disk.extend([file_id] * length)
-            file_id += 1
-        else:  # Free space
-            # Create a FreeSpace object and fill disk with None
-            free_spaces.append(FreeSpace(pos, length))
-            disk.extend([None] * length)
-        pos += length
+    # Start position of every span is the running total of the lengths before it
+    positions = np.concatenate(([0], np.cumsum(lengths)[:-1]))
 
-    return (files, free_spaces, disk)
+    # Even indices are files, odd indices are free spaces
+    return positions[::2], lengths[::2], positions[1::2], lengths[1::2]
 
 
-def compact_disk_blocks(disk):
+def span_checksum(file_id, position, size):
     """
-    Compact disk for part 1 by moving blocks using a deque.
+    Checksum contribution of `size` blocks of a file starting at `position`.
     
-    Strategy:
-    1. Move all non-None blocks to the left
-    2. Pad the end with None to maintain original disk size
+    The positions form an arithmetic series, so no per-block loop is needed.
     
     Args:
-        disk (list): Initial disk state
+        file_id (int): ID of the file stored in the blocks
+        position (int): Position of the first block
+        size (int): Number of consecutive blocks
     
     Returns:
-        list: Compacted disk with non-None blocks moved to the left
+        int: Sum of (position * file_id) over the blocks
     """
-    dq = deque(disk)
-    result = []
+    return file_id * (size * position + size * (size - 1) // 2)
 
-    while dq:
-        # Get next block from the left
-        block = dq.popleft()
-        if block is None:
-            # If it's a free space, find the rightmost file block
-            while dq and block is None:
-                block = dq.pop()
-        if block is not None:
-            result.append(block)
 
-    # Pad the result with None to maintain disk size
-    result.extend([None] * (len(disk) - len(result)))
-    return result
+def exact_sum(values):
+    """
+    Sum of an int64 array as a Python int.
+    
+    Checksums of large disks do not fit in int64, so the high and low 32
+    bits of the values are summed apart and put together at the end.
+    
+    Args:
+        values (numpy.ndarray): Values to add up
+    
+    Returns:
+        int: Their exact sum
+    """
+    return (int((values >> 32).sum()) << 32) + int((values & 0xFFFFFFFF).sum())
 
 
-def compact_disk_files(files, free_spaces, disk_size):
+def compact_disk_blocks(file_positions, file_sizes, free_positions, free_sizes):
     """
-    Compact disk for part 2 by moving whole files to free spaces.
+    Compact disk for part 1 by moving blocks from the end into the gaps.
     
     Strategy:
-    1. Process files from highest ID to lowest
-    2. Try to move each file to the leftmost compatible free space
-    3. If no free space fits the file, keep it in its original position
+    1. Once compacted, the disk holds exactly the first `total` blocks,
+       where `total` is the number of file blocks
+    2. File blocks left of `total` stay where they are
+    3. File blocks from `total` on, taken right to left, fill the free
+       blocks left of `total`, taken left to right
+    4. Both are runs of spans, so the pieces they pair up into are found
+       by merging their running totals, without a loop over blocks
     
     Args:
-        files (list): List of File objects
-        free_spaces (list): List of FreeSpace objects
-        disk_size (int): Total size of the disk
+        file_positions (numpy.ndarray): Start of every file, by ID
+        file_sizes (numpy.ndarray): Size of every file, by ID
+        free_positions (numpy.ndarray): Start of every free space
+        free_sizes (numpy.ndarray): Size of every free space
     
     Returns:
-        list: Compacted disk with files moved to optimize space
+        int: Checksum of the compacted disk
     """
-    result = [None] * disk_size
-    spaces = free_spaces.copy()  # Copy to modify safely
+    file_ids = np.arange(len(file_sizes))
+    total = int(file_sizes.sum())
+    file_ends = file_positions + file_sizes
 
-    # Process files from highest ID to lowest
-    for file in sorted(files, key=lambda x: -x.id):
-        moved = False
+    staying = np.clip(np.minimum(file_ends, total) - file_positions, 0, None)
+    checksum = exact_sum(span_checksum(file_ids, file_positions, staying))
 
-        # Try to fit file in each free space from left to right
-        for i, space in enumerate(spaces):
-            if space.position > file.position:
-                break
-            if space.size >= file.size:
-                # Move file to this space
-                pos = space.position
-                for j in range(file.size):
-                    result[pos + j] = file.id
-
-                # Update free space
-                spaces[i] = FreeSpace(
-                    space.position + file.size, space.size - file.size
-                )
-                if spaces[i].size == 0:
-                    spaces.pop(i)
-                moved = True
-                break
-
-        if not moved:
-            # Keep file in original position
-            pos = file.position
-            for j in range(file.size):
-                result[pos + j] = file.id
+    # Blocks moved out of each file, files taken right to left
+    moving = (file_ends - np.maximum(file_positions, total)).clip(0)[::-1]
+    moving_ends = np.cumsum(moving)
+    # Blocks filled in each free space, spaces taken left to right
+    filling = np.clip(np.minimum(free_positions + free_sizes, total) - free_positions, 0, None)
+    filling_ends = np.cumsum(filling)
 
-    return result
+    # Every piece starts where a file or a free space starts being used
+    moved = total - int(staying.sum())
+    starts = np.sort(np.concatenate((moving_ends - moving, filling_ends - filling)))
+    starts = starts[(starts < moved) & (np.diff(starts, prepend=-1) > 0)]
+    lengths = np.diff(np.append(starts, moved))
+    mover = np.searchsorted(moving_ends, starts, side="right")
+    space = np.searchsorted(filling_ends, starts, side="right")
+    positions = free_positions[space] + starts - (filling_ends - filling)[space]
+    return checksum + exact_sum(span_checksum(file_ids[::-1][mover], positions, lengths))
 
 
-def compute_checksum(disk):
+def compact_disk_files(file_positions, file_sizes, free_positions, free_sizes):
     """
-    Compute the checksum by multiplying file IDs with their positions.
+    Compact disk for part 2 by moving whole files to free spaces.
+    
+    Strategy:
+    1. Keep one min-heap of free space positions for each size 1-9
+    2. Process files from highest ID to lowest
+    3. The leftmost space a file fits in is the smallest heap top among
+       the sizes it fits in; the unused tail goes back in its own heap
+    4. If no free space left of the file fits it, it stays in place, and so
+       do all files of its size or larger after it: every space they could
+       use is right of it, and later tails only come from such spaces
     
     Args:
-        disk (list): Compacted disk state
+        file_positions (numpy.ndarray): Start of every file, by ID
+        file_sizes (numpy.ndarray): Size of every file, by ID
+        free_positions (numpy.ndarray): Start of every free space
+        free_sizes (numpy.ndarray): Size of every free space
     
     Returns:
-        int: Checksum calculated as sum of (position * file_id) for non-None blocks
+        int: Checksum of the compacted disk
     """
-    return sum(pos * file_id for pos, file_id in enumerate(disk) if file_id is not None)
+    # Free spaces are in position order, so each list is already a valid heap
+    spaces_by_size = [free_positions[free_sizes == size].tolist() for size in range(10)]
+
+    final_positions = file_positions.tolist()
+    # Files of this size or larger can no longer move
+    stuck_size = 10
+    sizes = file_sizes.tolist()
+    for file_id in range(len(sizes) - 1, -1, -1):
+        file_size = sizes[file_id]
+        if not file_size or file_size >= stuck_size:
+            continue
+        position = final_positions[file_id]
+        best_size = 0
+        for size in range(file_size, 10):
+            spaces = spaces_by_size[size]
+            if spaces and spaces[0] < position:
+                position = spaces[0]
+                best_size = size
+
+        if not best_size:
+            stuck_size = file_size
+            if stuck_size == 1:
+                break
+            continue
+        heapq.heappop(spaces_by_size[best_size])
+        left_over = best_size - file_size
+        if left_over:
+            heapq.heappush(spaces_by_size[left_over], position + file_size)
+        final_positions[file_id] = position
+
+    return exact_sum(span_checksum(np.arange(len(sizes)), np.array(final_positions), file_sizes))
 
 
 if __name__ == "__main__":
@@ -3,7 +3,6 @@ Advent of Code 2024
 Day 15: Warehouse Woes
 https://adventofcode.com/2024/day/15
 """
-from collections import defaultdict
 from time import perf_counter as measure_time
 
 def performance_profiler(method):
@@ -53,23 +52,28 @@ def parse_input(file_path):
     return parts[0], parts[1]
 
 
+# Grid tiles as bytes, so the warehouse can live in a flat bytearray
+WALL, EMPTY, ROBOT, BOX = b"#", b".", b"@", b"O"
+BOX_LEFT, BOX_RIGHT = b"[", b"]"
+
+
 def create_grid(raw_grid):
     """
-    Convert raw grid text into a dictionary-based grid representation.
+    Convert raw grid text into a flat bytearray grid representation.
+
+    The warehouse is surrounded by walls, so stepping by a direction stride
+    from any reachable tile never leaves the array.
 
     Args:
         raw_grid (str): Raw grid text from input file
 
     Returns:
-        tuple: A defaultdict grid and the starting position
+        tuple: The bytearray grid, its row width and the starting index
     """
-    grid = defaultdict(lambda: "#")
-    for y, line in enumerate(raw_grid.split("\n")):
-        for x, tile in enumerate(line):
-            grid[(x, y)] = tile
-            if tile == "@":
-                start = (x, y)
-    return grid, start
+    lines = raw_grid.split("\n")
+    width = len(lines[0])
+    grid = bytearray("".join(lines), "ascii")
+    return grid, width, grid.index(ROBOT)
 
 
 def scale_up_grid_text(raw_grid):
@@ -90,178 +94,192 @@ def scale_up_grid_text(raw_grid):
     return "\n".join(scaled_up)
 
 
-def move_direction(symbol):
+def move_direction(symbol, width):
     """
-    Convert movement symbols to coordinate deltas.
+    Convert movement symbols to index strides in a grid of the given width.
 
     Args:
         symbol (str): Movement direction symbol (^, v, <, >)
+        width (int): Row width of the grid
 
     Returns:
-        tuple: Coordinate delta for the given movement
+        int: Index stride for the given movement
     """
-    movements = {"^": (0, -1), "v": (0, 1), "<": (-1, 0), ">": (1, 0)}
+    movements = {"^": -width, "v": width, "<": -1, ">": 1}
     return movements[symbol]
 
 
-def next_position(position, move):
+def gps_change(move, width):
     """
-    Calculate the next position given current position and move.
+    Change in a box's GPS coordinate when it is pushed one step.
 
     Args:
-        position (tuple): Current (x, y) coordinates
-        move (tuple): Movement delta
+        move (int): Index stride of the movement
+        width (int): Row width of the grid
 
     Returns:
-        tuple: New (x, y) coordinates after moving
+        int: +-100 for vertical pushes, +-1 for horizontal ones
     """
-    px, py = position
-    dx, dy = move
-    return (px + dx, py + dy)
+    return move if abs(move) == 1 else 100 * (move // width)
 
 
-def sum_gps_coordinates(grid):
+def sum_gps_coordinates(grid, width):
     """
     Calculate the sum of GPS coordinates for specific grid tiles.
 
     Args:
-        grid (dict): Grid representation
+        grid (bytearray): Grid representation
+        width (int): Row width of the grid
 
     Returns:
         int: Sum of GPS coordinates
     """
-    return sum((100 * y + x) for (x, y) in grid if grid[(x, y)] in "O[")
+    return sum(100 * (i // width) + i % width
+               for i, tile in enumerate(grid) if tile in b"O[")
 
 
 @performance_profiler
-def part_one(current_pos, grid, moves):
+def part_one(current_pos, grid, width, moves):
     """
     Solve Part One: Navigate the grid and move boxes.
 
+    The GPS sum is computed once and then updated for every push, since a
+    run of k boxes moving one step changes it by k times the same amount.
+
     Args:
-        current_pos (tuple): Starting player position
-        grid (dict): Grid representation
-        moves (list): List of movement deltas
+        current_pos (int): Starting player index
+        grid (bytearray): Grid representation
+        width (int): Row width of the grid
+        moves (list): List of movement strides
 
     Returns:
         int: Sum of GPS coordinates after movements
     """
+    gps_total = sum_gps_coordinates(grid, width)
+    wall, empty, box = ord(WALL), ord(EMPTY), ord(BOX)
+
     for move in moves:
-        new_pos = next_position(current_pos, move)
+        new_pos = current_pos + move
+        tile = grid[new_pos]
         # Skip if new position is a wall
-        if grid[new_pos] == "#":
+        if tile == wall:
             continue
         # Handle box movement
-        elif grid[new_pos] == "O":
+        if tile == box:
             # Find end of current box sequence
-            end_box = new_pos
-            while grid[end_box] == "O":
-                end_box = next_position(end_box, move)
+            end_box = new_pos + move
+            while grid[end_box] == box:
+                end_box += move
 
             # Cannot move if blocked by wall
-            if grid[end_box] == "#":
+            if grid[end_box] == wall:
                 continue
-            else:
-                grid[end_box] = "O"
-                grid[new_pos] = "@"
-                grid[current_pos] = "."
-                current_pos = new_pos
+            # The first box of the run jumps to the free tile at its end
+            grid[end_box] = box
+            gps_total += (end_box - new_pos) // move * gps_change(move, width)
 
-        # Simple movement
-        elif grid[new_pos] == ".":
-            grid[new_pos] = "@"
-            grid[current_pos] = "."
-            current_pos = new_pos
+        grid[new_pos] = ord(ROBOT)
+        grid[current_pos] = empty
+        current_pos = new_pos
 
-    return sum_gps_coordinates(grid)
+    return gps_total
 
 
 @performance_profiler
-def part_two(current_pos, grid, moves):
+def part_two(current_pos, grid, width, moves):
     """
     Solve Part Two: Navigate a scaled-up grid with more complex box movements.
 
+    Horizontal pushes shift the run of box tiles with one slice assignment.
+    Vertical pushes collect the boxes to move row by row (a BFS outward from
+    the robot) into a reused list, then move them farthest row first.
+
     Args:
-        current_pos (tuple): Starting player position
-        grid (dict): Grid representation
-        moves (list): List of movement deltas
+        current_pos (int): Starting player index
+        grid (bytearray): Grid representation
+        width (int): Row width of the grid
+        moves (list): List of movement strides
 
     Returns:
         int: Sum of GPS coordinates after movements
     """
-
-    def can_move(box_pos, move, boxes):
-        """
-        Recursively check if boxes can be moved without hitting walls.
-
-        Args:
-            box_pos (tuple): Current box position
-            move (tuple): Movement delta
-            boxes (set): Set to track moved boxes
-
-        Returns:
-            bool: Whether boxes can be moved
-        """
-        checked = set()
-        # Handle different box sides
-        if grid[box_pos] == "[":
-            checked = set([box_pos, next_position(box_pos, move_direction(">"))])
-        elif grid[box_pos] == "]":
-            checked = set([box_pos, next_position(box_pos, move_direction("<"))])
-
-        new_positions = set([next_position(p, move) for p in checked]) - checked
-
-        # Fail if new positions would hit a wall
-        if any(grid[p] == "#" for p in new_positions):
-            return False
-
-        # Recursively check if all new positions are valid
-        valid = all(grid[p] == "." or can_move(p, move, boxes) for p in new_positions)
-
-        if valid:
-            for c in checked:
-                boxes.add(c)
-            return valid
-
-        return False
+    gps_total = sum_gps_coordinates(grid, width)
+    wall, empty = ord(WALL), ord(EMPTY)
+    box_left, box_right = ord(BOX_LEFT), ord(BOX_RIGHT)
+    pushed = []  # Left halves of the boxes moved by the current push
+
+    def collect_vertical_push(first, move):
+        """Fill `pushed` with every box moved by pushing the one at `first`; False if blocked."""
+        pushed.clear()
+        row = [first if grid[first] == box_left else first - 1]
+        while row:
+            pushed.extend(row)
+            next_row = []
+            for box_pos in row:
+                target = box_pos + move
+                for tile_pos in (target, target + 1):
+                    tile = grid[tile_pos]
+                    if tile == wall:
+                        return False
+                    if tile == box_left:
+                        left = tile_pos
+                    elif tile == box_right:
+                        left = tile_pos - 1
+                    else:
+                        continue
+                    if not next_row or next_row[-1] != left:
+                        next_row.append(left)
+            row = next_row
+        return True
 
     for move in moves:
-        new_pos = next_position(current_pos, move)
-        if grid[new_pos] == "#":
+        new_pos = current_pos + move
+        tile = grid[new_pos]
+        if tile == wall:
             continue
-        elif grid[new_pos] in "[]":
-            boxes = set()
-            if can_move(new_pos, move, boxes):
-                # Move boxes and update grid
-                new_boxes = {}
-                for box_pos in boxes:
-                    new_boxes[next_position(box_pos, move)] = grid[box_pos]
-                    grid[box_pos] = "."
-                for box_pos in new_boxes:
-                    grid[box_pos] = new_boxes[box_pos]
-                grid[new_pos] = "@"
-                grid[current_pos] = "."
-                current_pos = new_pos
-        elif grid[new_pos] == ".":
-            grid[new_pos] = "@"
-            grid[current_pos] = "."
-            current_pos = new_pos
-
-    return sum_gps_coordinates(grid)
+        elif tile == box_left or tile == box_right:
+            if abs(move) == 1:
+                end_box = new_pos
+                while grid[end_box] in (box_left, box_right):
+                    end_box += move
+                if grid[end_box] == wall:
+                    continue
+                # Shift the whole run of box tiles one step in a single slice
+                if move == 1:
+                    grid[new_pos + 1:end_box + 1] = grid[new_pos:end_box]
+                else:
+                    grid[end_box:new_pos] = grid[end_box + 1:new_pos + 1]
+                gps_total += abs(end_box - new_pos) // 2 * move
+            else:
+                if not collect_vertical_push(new_pos, move):
+                    continue
+                for box_pos in reversed(pushed):
+                    grid[box_pos] = grid[box_pos + 1] = empty
+                    grid[box_pos + move] = box_left
+                    grid[box_pos + move + 1] = box_right
+                gps_total += len(pushed) * gps_change(move, width)
+
+        grid[new_pos] = ord(ROBOT)
+        grid[current_pos] = empty
+        current_pos = new_pos
+
+    return gps_total
 
 
 if __name__ == "__main__":
     raw_grid, raw_moves = parse_input("input.txt")
 
-    moves = list(map(lambda d: move_direction(d), "".join(raw_moves.split("\n"))))
+    raw_moves = "".join(raw_moves.split("\n"))
 
-    grid, start = create_grid(raw_grid)
+    grid, width, start = create_grid(raw_grid)
+    moves = [move_direction(d, width) for d in raw_moves]
 
-    p1 = part_one(start, grid, moves)
+    p1 = part_one(start, grid, width, moves)
     print(f"Part 1: {p1}")
 
     scaled_text = scale_up_grid_text(raw_grid)
-    grid, start = create_grid(scaled_text)
+    grid, width, start = create_grid(scaled_text)
+    moves = [move_direction(d, width) for d in raw_moves]
 
-    p2 = part_two(start, grid, moves)
+    p2 = part_two(start, grid, width, moves)
     print(f"Part 2: {p2}")
@@ -3,8 +3,8 @@ Advent of Code 2024
 Day 20: Race Condition
 https://adventofcode.com/2024/day/20
 """
-import networkx as nx
-from itertools import product
+import numpy as np
+from collections import deque
 from time import perf_counter as measure_time
 
 def performance_profiler(method):
@@ -40,113 +40,120 @@ def performance_profiler(method):
 
 def parse_input(file_path):
     with open(file_path, "r") as f:
-        grid = [list(line.strip()) for line in f]
-    
+        grid = [list(line.strip()) for line in f if line.strip()]
+
     # Use next() with generator expression instead of nested loops
-    start = next((i, j) for i, row in enumerate(grid) 
+    start = next((i, j) for i, row in enumerate(grid)
                  for j, cell in enumerate(row) if cell == 'S')
-    end = next((i, j) for i, row in enumerate(grid) 
+    end = next((i, j) for i, row in enumerate(grid)
                for j, cell in enumerate(row) if cell == 'E')
-    
+
     if start == (-1, -1) or end == (-1, -1):
         raise ValueError("Start or end position not found in grid")
     return grid, start, end
 
 
-def build_graph(grid, allow_walls = False):
-    """Build a graph representation of the grid."""
-    G = nx.Graph()
-    height, width = len(grid), len(grid[0])
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-    
-    for y, x in product(range(height), range(width)):
-        if not allow_walls and grid[y][x] == '#':
-            continue
-        pos = (y, x)
-        for dy, dx in directions:
-            new_y, new_x = y + dy, x + dx
-            if (0 <= new_y < height and 
-                0 <= new_x < width and 
-                (allow_walls or grid[new_y][new_x] in '.SE')):
-                G.add_edge(pos, (new_y, new_x), weight=1)
-    
-    return G
+class RaceTrack:
+    """Flat-array view of the maze padded so any cheat offset stays in bounds.
 
+    The grid is surrounded by `padding` extra wall cells on every side, which
+    lets a cell index plus a (dy, dx) cheat offset be used without any bounds
+    checks or wrap-around between rows.
+    """
+    def __init__(self, grid, padding):
+        self.padding = padding
+        self.height = len(grid) + 2 * padding
+        self.width = len(grid[0]) + 2 * padding
+        self.open = np.zeros(self.height * self.width, dtype=bool)
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell != '#':
+                    self.open[self.index((y, x))] = True
+
+    def index(self, pos):
+        """Flat index of a (y, x) position of the unpadded grid."""
+        y, x = pos
+        return (y + self.padding) * self.width + (x + self.padding)
+
+    def distance_field(self, source):
+        """BFS step counts from `source` to every open cell (-1 if unreachable)."""
+        dist = np.full(self.open.size, -1, dtype=np.int64)
+        open_cells = self.open
+        steps = (1, -1, self.width, -self.width)
+        start = self.index(source)
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            next_dist = dist[cell] + 1
+            for step in steps:
+                neighbour = cell + step
+                if open_cells[neighbour] and dist[neighbour] < 0:
+                    dist[neighbour] = next_dist
+                    queue.append(neighbour)
+        return dist
+
+
+def diamond_offsets(radius):
+    """All (dy, dx) with 1 < |dy| + |dx| <= radius, i.e. moves worth cheating."""
+    return [(dy, dx)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius + abs(dy), radius - abs(dy) + 1)
+            if abs(dy) + abs(dx) > 1]
+
+
+def count_cheats(grid, start, end, max_cheat_steps, min_saving=100):
+    """Count the cheats that save at least `min_saving` picoseconds.
+
+    A cheat jumps from track cell a to track cell b with |a - b| <= radius,
+    costing the Manhattan distance between them. With BFS distance fields
+    from the start and from the end, a cheat takes
+
+        from_start[a] + |a - b| + to_end[b]
+
+    so every cheat of a given offset can be tested for all track cells at once
+    with a single vectorized comparison.
 
-def find_all_cheats(grid, start, end, max_cheat_steps):
-    """Find all possible cheats that save at least 100 steps.
-    
     Args:
         grid: 2D list representing the maze
         start: Tuple (y, x) of start position
         end: Tuple (y, x) of end position
         max_cheat_steps: Maximum number of steps allowed through walls
-        
+        min_saving: Minimum number of picoseconds a cheat must save
+
     Returns:
-        List of integers representing time saved for each valid cheat
+        Number of cheats saving at least `min_saving` picoseconds
     """
-    # Build initial graph and get normal path length
-    G = build_graph(grid)
-    try:
-        normal_time = nx.shortest_path_length(G, start, end, weight="weight")
-    except nx.NetworkXNoPath:
-        return []
+    track = RaceTrack(grid, padding=max_cheat_steps)
+    from_start = track.distance_field(start)
+    to_end = track.distance_field(end)
+    normal_time = from_start[track.index(end)]
+    if normal_time < 0:
+        return 0
 
-    valid_tiles = set([".", "S", "E"])
+    # Track cells reachable from the start, in path order
+    cells = np.flatnonzero((from_start >= 0) & (to_end >= 0))
+    cells = cells[np.argsort(from_start[cells], kind="stable")]
+    # A cheat may take at most this long to be worth counting
+    budget = from_start[cells] + min_saving - normal_time
 
-    # Build graph that includes wall passages
-    G_walls = build_graph(grid, allow_walls=True)
-    
-    # Pre-calculate all shortest paths from start and to end
-    start_distances = nx.single_source_dijkstra_path_length(G, start, weight="weight")
-    end_distances = nx.single_source_dijkstra_path_length(G, end, weight="weight")
-    
-    saved_times = []
-    height, width = len(grid), len(grid[0])
-    max_end_dist = normal_time - 100  # Maximum distance from cheat end to end
-    
-    # For each valid path position
-    for y, x in product(range(height), range(width)):
-        if grid[y][x] not in valid_tiles:
-            continue
-        start_pos = (y, x)
-        if start_pos not in start_distances:
-            continue
-            
-        start_dist = start_distances[start_pos]
-        
-        # Find all reachable positions within max_cheat_steps
-        cheat_ends = nx.single_source_dijkstra_path_length(G_walls, start_pos, cutoff=max_cheat_steps)
-        
-        # Check each possible cheat end
-        for end_pos, cheat_steps in cheat_ends.items():
-            if grid[end_pos[0]][end_pos[1]] not in valid_tiles:
-                continue
-            if end_pos not in end_distances:
-                continue
-                
-            end_dist = end_distances[end_pos]
-            if end_dist > max_end_dist:
-                continue
-                
-            # Calculate total time with cheat
-            cheat_time = start_dist + cheat_steps + end_dist
-            time_saved = normal_time - cheat_time
-            
-            if time_saved >= 100:
-                saved_times.append(time_saved)
-    
-    return saved_times
+    total = 0
+    for dy, dx in diamond_offsets(max_cheat_steps):
+        targets = to_end[cells + dy * track.width + dx]
+        # -1 marks walls/unreachable cells, which end no cheat
+        valid = (targets >= 0) & (targets + abs(dy) + abs(dx) + budget <= 0)
+        total += int(np.count_nonzero(valid))
+    return total
 
 
 @performance_profiler
 def part_one(grid, start, end):
-    return len(find_all_cheats(grid, start, end, max_cheat_steps=2))
+    return count_cheats(grid, start, end, max_cheat_steps=2)
 
 
 @performance_profiler
 def part_two(grid, start, end):
-    return len(find_all_cheats(grid, start, end, max_cheat_steps=20))
+    return count_cheats(grid, start, end, max_cheat_steps=20)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,6 @@ Advent of Code 2024
 Day 21: Keypad Conundrum
 https://adventofcode.com/2024/day/21
 """
-from collections import Counter
 from time import perf_counter as measure_time
 
 def performance_profiler(method):
@@ -37,227 +36,128 @@ def performance_profiler(method):
     return timing_wrapper
 
 
-def calculate_manhattan_distance(point1, point2):
-    """
-    Calculate the Manhattan distance between two complex number points.
-    
-    Args:
-        point1 (complex): First point in complex plane
-        point2 (complex): Second point in complex plane
-    
-    Returns:
-        float: Manhattan distance between the points
-    """
-    return abs(point1.real - point2.real) + abs(point1.imag - point2.imag)
+NUMBER_KEYPAD = "789,456,123,_0A"
+DIRECTION_KEYPAD = "_^A,<v>"
+DIRECTION_KEYS = "^<>vA"
 
 
 def create_keypad_mapping(keypad_layout):
     """
-    Convert a string representation of a keypad into a dictionary mapping characters to complex coordinates.
+    Convert a string representation of a keypad into a dictionary mapping characters to (row, col) positions.
     
     Args:
-        keypad_layout (str): Comma-separated string representing keypad layout
+        keypad_layout (str): Comma-separated string representing keypad layout,
+                             with '_' marking the gap the arm must avoid
         
     Returns:
-        dict: Mapping of characters to their complex number positions
+        dict: Mapping of characters to their (row, col) positions, including '_'
     """
     return {
-        char: row_idx + 1j * col_idx
+        char: (row_idx, col_idx)
         for row_idx, row in enumerate(keypad_layout.split(','))
         for col_idx, char in enumerate(row)
-        if char != '_'
     }
 
 
-def find_shortest_paths(start_pos, end_pos, keypad):
-    """
-    Find all shortest paths between two positions using DFS.
-    
-    Args:
-        start_pos (complex): Starting position
-        end_pos (complex): Target position
-        keypad (dict): Mapping of valid positions
-        
-    Returns:
-        list: List of possible direction sequences to reach the target
-    """
-    exploration_stack = [(start_pos, [])]
-    valid_paths = []
-    directions = (1, -1, 1j, -1j)
-    direction_to_symbol = {1: 'v', -1: '^', 1j: '>', -1j: '<'}
-    
-    while exploration_stack:
-        current_pos, path = exploration_stack.pop()
-        
-        if current_pos == end_pos:
-            valid_paths.append(path)
-            continue
-            
-        for direction in directions:
-            next_pos = current_pos + direction
-            if (calculate_manhattan_distance(next_pos, end_pos) >= 
-                calculate_manhattan_distance(current_pos, end_pos) or 
-                next_pos not in keypad.values()):
-                continue
-            exploration_stack.append((next_pos, path + [direction]))
-
-    return [''.join(direction_to_symbol[d] for d in path) for path in valid_paths]
-
-
-def generate_input_sequences(sequence, keypad):
-    """
-    Generate all possible shortest input sequences to type a given sequence on the keypad.
-    
-    Args:
-        sequence (str): Target sequence to type
-        keypad (dict): Keypad layout mapping
-        
-    Returns:
-        list: All possible shortest input sequences
+def candidate_paths(start_key, end_key, keypad):
     """
-    sequence = 'A' + sequence
-    current_paths = ['']
+    Moves worth considering from one key to another, as indices into DIRECTION_KEYS.
     
-    for i in range(len(sequence)-1):
-        new_paths = []
-        for current_path in current_paths:
-            for shortest_path in find_shortest_paths(
-                keypad[sequence[i]], 
-                keypad[sequence[i+1]], 
-                keypad
-            ):
-                new_paths.append(current_path + shortest_path + 'A')
-        current_paths = new_paths
-        
-    return current_paths
-
-
-def find_optimal_sequences(sequences, keypad):
-    """
-    Find all possible sequences of minimum length to type any of the given sequences.
+    A shortest path that changes direction more than once is never cheaper
+    for the robot above, so only "all horizontal then all vertical" and
+    "all vertical then all horizontal" are candidates, minus any whose
+    corner is the gap. Every candidate ends with a press of 'A'.
     
     Args:
-        sequences (list): List of (character, sequence) tuples
-        keypad (dict): Keypad layout mapping
+        start_key (str): Key the arm is on
+        end_key (str): Key to press next
+        keypad (dict): Mapping of keys to (row, col) positions
         
     Returns:
-        list: Optimal sequences with minimum length
+        list: Candidate key sequences, each a tuple of DIRECTION_KEYS indices
     """
-    def calculate_sequence_length(seq):
-        return sum(calculate_manhattan_distance(
-            keypad[seq[i]], keypad[seq[i+1]]
-        ) for i in range(len(seq)-1))
+    (start_row, start_col), (end_row, end_col) = keypad[start_key], keypad[end_key]
+    vertical = ("v" if end_row > start_row else "^") * abs(end_row - start_row)
+    horizontal = (">" if end_col > start_col else "<") * abs(end_col - start_col)
+    gap = keypad["_"]
 
-    min_length = float('inf')
-    min_length_sequences = []
-    
-    for char, seq in sequences:
-        current_length = calculate_sequence_length(seq)
-        if current_length < min_length:
-            min_length_sequences = [(char, seq)]
-            min_length = current_length
-        elif current_length == min_length:
-            min_length_sequences.append((char, seq))
+    paths = set()
+    if (start_row, end_col) != gap:
+        paths.add(horizontal + vertical + "A")
+    if (end_row, start_col) != gap:
+        paths.add(vertical + horizontal + "A")
+    return [tuple(DIRECTION_KEYS.index(key) for key in path) for path in paths]
 
-    return [
-        (char, x) 
-        for char, seq in min_length_sequences
-        for x in generate_input_sequences(seq, keypad)
-    ]
 
-
-def precalculate_best_paths(direction_keypad):
+def sequence_cost(sequence, cost_matrix):
     """
-    Precalculate optimal paths between all direction pairs.
+    Presses needed to type a sequence on a directional keypad, starting on 'A'.
     
     Args:
-        direction_keypad (dict): Direction keypad layout
+        sequence (tuple): DIRECTION_KEYS indices to press, in order
+        cost_matrix (list): cost_matrix[a][b] is the cost of pressing b with the arm on a
         
     Returns:
-        dict: Mapping of direction pairs to their optimal paths
+        int: Total cost
     """
-    valid_directions = "^<>vA"
-    best_paths = {}
-    
-    for dir1 in valid_directions:
-        for dir2 in valid_directions:
-            paths = [(x, x) for x in find_shortest_paths(
-                direction_keypad[dir1],
-                direction_keypad[dir2],
-                direction_keypad
-            )]
-            
-            while len(set(x for x, _ in paths)) != 1:
-                paths = find_optimal_sequences(paths, direction_keypad)
-                
-            best_paths[(dir1, dir2)] = paths[0][0]
-            
-    return best_paths
+    previous = DIRECTION_KEYS.index("A")
+    total = 0
+    for key in sequence:
+        total += cost_matrix[previous][key]
+        previous = key
+    return total
 
 
-def optimize_sequence(sequence_data, best_paths):
+def layer_cost_matrices(depth):
     """
-    Optimize the given sequence using pre-calculated best paths.
+    Cost matrices of the directional keypads for every number of robot layers.
     
-    Args:
-        sequence_data (tuple): Tuple of (transitions Counter, first character)
-        best_paths (dict): Precalculated optimal paths
-        
-    Returns:
-        tuple: Optimized sequence data
-    """
-    transitions, first_char = sequence_data
-    optimized_transitions = Counter()
-    
-    start_sequence = best_paths[('A', first_char)] + 'A'
-    new_first_char = start_sequence[0]
-    transitions[('A', first_char)] += 1
-    optimized_transitions[('A', new_first_char)] -= 1
-    
-    for (char1, char2), count in transitions.items():
-        path = 'A' + best_paths[(char1, char2)] + 'A'
-        for i in range(len(path) - 1):
-            optimized_transitions[(path[i], path[i+1])] += count
-
-    return (optimized_transitions, new_first_char)
-
-
-def convert_to_transition_counter(sequence):
-    """
-    Convert a sequence into a Counter of character transitions.
+    Layer 0 is typed by a human, so every press costs 1. The cost of pressing
+    b after a on layer k + 1 is the cheapest candidate path from a to b, typed
+    on layer k. Each layer is a 5x5 min-plus composition with the one below.
     
     Args:
-        sequence (str): Input sequence
+        depth (int): Number of directional robot keypads
         
     Returns:
-        tuple: (Counter of transitions, first character)
+        list: depth + 1 cost matrices, indexed by layer
     """
-    transitions = Counter()
-    for i in range(len(sequence)-1):
-        transitions[(sequence[i], sequence[i+1])] += 1
-    return (transitions, sequence[0])
+    direction_keypad = create_keypad_mapping(DIRECTION_KEYPAD)
+    paths = [[candidate_paths(start, end, direction_keypad) for end in DIRECTION_KEYS]
+             for start in DIRECTION_KEYS]
+
+    matrices = [[[1] * len(DIRECTION_KEYS) for _ in DIRECTION_KEYS]]
+    for _ in range(depth):
+        below = matrices[-1]
+        matrices.append([
+            [min(sequence_cost(path, below) for path in paths[a][b]) for b in range(len(DIRECTION_KEYS))]
+            for a in range(len(DIRECTION_KEYS))
+        ])
+    return matrices
 
 
-def solve_sequence(sequence, number_keypad, best_paths, iterations):
+def cost(code, depth, matrices=None):
     """
-    Solve the sequence optimization for given number of iterations.
+    Fewest human presses to type a code on the number keypad through robot layers.
     
     Args:
-        sequence (str): Input sequence
-        number_keypad (dict): Number keypad layout
-        best_paths (dict): Precalculated optimal paths
-        iterations (int): Number of optimization iterations
+        code (str): Code to type, e.g. "029A"
+        depth (int): Number of directional robot keypads between human and door
+        matrices (list): Optional precomputed layer_cost_matrices(depth) or deeper
         
     Returns:
-        int: Minimum number of steps required
+        int: Minimum number of presses
     """
-    sequences = [convert_to_transition_counter(seq) 
-                for seq in generate_input_sequences(sequence, number_keypad)]
-    
-    for _ in range(iterations):
-        sequences = [optimize_sequence(seq, best_paths) for seq in sequences]
+    if matrices is None:
+        matrices = layer_cost_matrices(depth)
+    cost_matrix = matrices[depth]
+    number_keypad = create_keypad_mapping(NUMBER_KEYPAD)
 
-    return min(sum(seq[0].values()) + 1 for seq in sequences)
+    total = 0
+    for start_key, end_key in zip("A" + code, code):
+        total += min(sequence_cost(path, cost_matrix)
+                     for path in candidate_paths(start_key, end_key, number_keypad))
+    return total
 
 
 @performance_profiler
@@ -271,12 +171,7 @@ def solve_day_21(codes):
     Returns:
         tuple: Results for part 1 and part 2
     """
-    # Create keypad mappings
-    number_keypad = create_keypad_mapping("789,456,123,_0A")
-    direction_keypad = create_keypad_mapping("_^A,<v>")
-    
-    # Precalculate optimal paths
-    best_paths = precalculate_best_paths(direction_keypad)
+    matrices = layer_cost_matrices(25)
     
     # Initialize results
     part1 = part2 = 0
@@ -284,8 +179,8 @@ def solve_day_21(codes):
     # Calculate results for each code
     for code in codes:
         multiplier = int(code[:3])
-        part1 += int(multiplier * solve_sequence(code, number_keypad, best_paths, 2))
-        part2 += int(multiplier * solve_sequence(code, number_keypad, best_paths, 25))
+        part1 += multiplier * cost(code, 2, matrices)
+        part2 += multiplier * cost(code, 25, matrices)
 
     return part1, part2
 
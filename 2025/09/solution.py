@@ -6,6 +6,8 @@ https://adventofcode.com/2025/day/9
 from itertools import combinations
 from pathlib import Path
 
+import numpy as np
+
 # Type aliases for clarity
 # Coord: (x, y) - 2D point with integer coordinates
 Coord = tuple[int, int]
@@ -94,126 +96,121 @@ def separate_polygon_edges(polygon):
     return vertical_edges, horizontal_edges
 
 
-def rectangle_intersects_polygon_interior(
-    rect_min_x: int,
-    rect_max_x: int,
-    rect_min_y: int,
-    rect_max_y: int,
-    vertical_edges: list[Edge],
-    horizontal_edges: list[Edge],
-) -> bool:
+def rasterize_interior(polygon, xs, ys):
     """
-    Check if a rectangle's interior is crossed by any polygon edges.
-    
-    Edges touching the rectangle boundary are allowed; only interior
-    crossings invalidate the rectangle.
+    Rasterize the inside of the polygon onto the coordinate-compressed grid.
+
+    Only the "gap" cells strictly between consecutive distinct coordinates are
+    stored, with an extra gap before the first and after the last one, so
+    gap cell (gy, gx) covers the open box ys[gy-1] < y < ys[gy] by
+    xs[gx-1] < x < xs[gx]. No edge passes through a gap cell, so each one is
+    wholly inside or wholly outside; a ray cast to the left decides which.
+    Every vertical edge toggles the parity of the gap rows it spans, so the
+    whole grid is a cumulative XOR along x.
     """
-    # Check vertical edges crossing through the rectangle's interior
-    for edge in vertical_edges:
-        edge_x, edge_y_start, edge_y_end = edge
-        
-        # Edge must be strictly between left and right bounds (not on boundary)
-        if rect_min_x < edge_x < rect_max_x:
-            # Check if edge's y-range overlaps with rectangle's y-range
-            overlap_start = max(edge_y_start, rect_min_y)
-            overlap_end = min(edge_y_end, rect_max_y)
-            
-            if overlap_start < overlap_end:
-                return True
-    
-    # Check horizontal edges crossing through the rectangle's interior
-    for edge in horizontal_edges:
-        edge_y, edge_x_start, edge_x_end = edge
-        
-        # Edge must be strictly between bottom and top bounds (not on boundary)
-        if rect_min_y < edge_y < rect_max_y:
-            # Check if edge's x-range overlaps with rectangle's x-range
-            overlap_start = max(edge_x_start, rect_min_x)
-            overlap_end = min(edge_x_end, rect_max_x)
-            
-            if overlap_start < overlap_end:
-                return True
-    
-    return False
+    x_index = {x: i for i, x in enumerate(xs)}
+    y_index = {y: i for i, y in enumerate(ys)}
+    vertical_edges, _ = separate_polygon_edges(polygon)
+
+    crossings = np.zeros((len(ys) + 1, len(xs) + 1), dtype=np.uint8)
+    for edge_x, edge_y_start, edge_y_end in vertical_edges:
+        # The edge crosses the gap rows between its end points
+        crossings[y_index[edge_y_start] + 1:y_index[edge_y_end] + 1, x_index[edge_x] + 1] ^= 1
+
+    return np.bitwise_xor.accumulate(crossings, axis=1).astype(bool)
+
+
+def outside_prefix_sums(inside):
+    """2D prefix sums of the gap cells outside the polygon, with a zero border."""
+    sums = np.zeros((inside.shape[0] + 1, inside.shape[1] + 1), dtype=np.int32)
+    sums[1:, 1:] = (~inside).cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+    return sums
 
 
-def point_inside_polygon(test_x: float, test_y: float, polygon: list[Coord]) -> bool:
+def segment_inside(inside, a1, a2, b1, b2):
     """
-    Use the ray casting algorithm to determine if a point lies inside a polygon.
-    
-    Works by casting a ray from the test point to infinity and counting edge
-    crossings: odd number of crossings = inside, even = outside.
+    Check a one-tile-wide rectangle between compressed corners.
+
+    A point on a grid line is inside (or on the boundary) exactly when one of
+    the gap cells on either side of it is inside.
     """
-    inside = False
-    
-    # Test ray intersection with each polygon edge
-    for i in range(len(polygon) - 1):
-        vertex1 = polygon[i]
-        vertex2 = polygon[i + 1]
-        x1, y1 = float(vertex1[0]), float(vertex1[1])
-        x2, y2 = float(vertex2[0]), float(vertex2[1])
-        
-        # Check if horizontal ray from test point crosses this edge
-        if (y1 > test_y) != (y2 > test_y):
-            # Calculate x-coordinate where ray intersects the edge
-            intersection_x = (x2 - x1) * (test_y - y1) / (y2 - y1) + x1
-            
-            # If intersection is to the right of test point, toggle inside/outside
-            if test_x < intersection_x:
-                inside = not inside
-    
-    return inside
+    if a1 == a2:
+        column = inside[b1 + 1:b2 + 1, a1] | inside[b1 + 1:b2 + 1, a1 + 1]
+        return bool(column.all())
+    row = inside[b1, a1 + 1:a2 + 1] | inside[b1 + 1, a1 + 1:a2 + 1]
+    return bool(row.all())
 
 
 def find_max_interior_rectangle(coords: list[Coord]) -> int:
     """
     Find the largest axis-aligned rectangle that fits completely inside the
-    given polygon. Uses exhaustive search with pruning optimizations.
+    given polygon.
+
+    The polygon is rasterized once onto its coordinate-compressed grid and
+    turned into a prefix sum of outside cells. A rectangle with distinct x
+    and y spans is inside exactly when the gap cells strictly between its
+    corners are, which is an O(1) lookup. For each corner, all partners are
+    checked at once with NumPy, visiting corners with the largest possible
+    area first and stopping once none can beat the best found.
     """
     # Simplify polygon by removing collinear points
     corners = remove_collinear_points(coords)
-    
+
     # Create closed polygon by appending first corner to end
     polygon = corners + [corners[0]]
-    
-    # Classify edges for efficient intersection testing
-    vertical_edges, horizontal_edges = separate_polygon_edges(polygon)
-    
+
+    xs = sorted({x for x, _ in corners})
+    ys = sorted({y for _, y in corners})
+    inside = rasterize_interior(polygon, xs, ys)
+    outside = outside_prefix_sums(inside)
+
+    corner_x = np.array([x for x, _ in corners], dtype=np.int64)
+    corner_y = np.array([y for _, y in corners], dtype=np.int64)
+    # Compressed line index of each corner
+    line_x = np.searchsorted(xs, corner_x)
+    line_y = np.searchsorted(ys, corner_y)
+
+    # Largest rectangle each corner could possibly be part of
+    reach = ((np.maximum(corner_x - xs[0], xs[-1] - corner_x) + 1)
+             * (np.maximum(corner_y - ys[0], ys[-1] - corner_y) + 1))
+
+    order = np.argsort(-reach, kind="stable")
+    corner_x, corner_y = corner_x[order], corner_y[order]
+    line_x, line_y, reach = line_x[order], line_y[order], reach[order]
+
     max_area = 0
-    
-    # Test all pairs of corners as potential rectangle diagonals
-    for corner_a, corner_b in combinations(corners, 2):
-        # Compute axis-aligned bounding box
-        rect_min_x = min(corner_a[0], corner_b[0])
-        rect_max_x = max(corner_a[0], corner_b[0])
-        rect_min_y = min(corner_a[1], corner_b[1])
-        rect_max_y = max(corner_a[1], corner_b[1])
-        
-        width = rect_max_x - rect_min_x + 1
-        height = rect_max_y - rect_min_y + 1
+
+    for i in range(len(order)):
+        if reach[i] <= max_area:
+            break
+
+        # Pairs with corners visited earlier have already been checked
+        width = np.abs(corner_x[i + 1:] - corner_x[i]) + 1
+        height = np.abs(corner_y[i + 1:] - corner_y[i]) + 1
         area = width * height
-        
-        # Pruning: skip if this rectangle can't beat current maximum
-        if area <= max_area:
+        candidates = np.flatnonzero(area > max_area)
+        if not len(candidates):
             continue
-        
-        # Ensure no polygon edges cross through rectangle interior
-        if rectangle_intersects_polygon_interior(
-            rect_min_x, rect_max_x, rect_min_y, rect_max_y,
-            vertical_edges, horizontal_edges
-        ):
-            continue
-        
-        # Ensure rectangle center is inside the polygon
-        # Using center point with 0.5 offset to avoid edge cases
-        center_x = rect_min_x + 0.5
-        center_y = rect_min_y + 0.5
-        if not point_inside_polygon(center_x, center_y, polygon):
-            continue
-        
-        # This rectangle is valid and larger than previous maximum
-        max_area = area
-    
+        partners = candidates + i + 1
+
+        a1 = np.minimum(line_x[partners], line_x[i])
+        a2 = np.maximum(line_x[partners], line_x[i])
+        b1 = np.minimum(line_y[partners], line_y[i])
+        b2 = np.maximum(line_y[partners], line_y[i])
+
+        # Outside gap cells strictly between the corners
+        blocked = (outside[b2 + 1, a2 + 1] - outside[b1 + 1, a2 + 1]
+                   - outside[b2 + 1, a1 + 1] + outside[b1 + 1, a1 + 1])
+        solid = (a1 < a2) & (b1 < b2)
+        valid = solid & (blocked == 0)
+        if valid.any():
+            max_area = max(max_area, int(area[candidates[valid]].max()))
+
+        # Rectangles one tile wide or tall have no gap cells inside them
+        for k in np.flatnonzero(~solid):
+            if area[candidates[k]] > max_area and segment_inside(inside, a1[k], a2[k], b1[k], b2[k]):
+                max_area = int(area[candidates[k]])
+
     return max_area
 
 
@@ -0,0 +1,116 @@
+"""
+Cycle detection for simulations that settle into a loop.
+
+Two detectors, for two kinds of state:
+
+- find_cycle and extrapolate use Brent's algorithm. They hold a couple of
+  states at a time, whatever the period, but replay the simulation from
+  the start, so `step_fn` must return a new state and leave its argument
+  alone. Use them when a state is cheap to step and compare.
+- find_period and extrapolate_in_place remember a 64-bit fingerprint and
+  a metric per step instead, and never step a state twice, so `step_fn`
+  may change the state in place. Use them when a state is large or
+  mutated by its simulator. Memory grows with the steps taken, not with
+  the size of a state.
+
+Solutions import this module by putting the repository root on sys.path.
+"""
+from itertools import count
+
+
+def find_cycle(step_fn, state, key=None, limit=None):
+    """
+    Brent's cycle detection on key(state): (index of the first state that repeats, period).
+
+    Returns (None, None) if no key has come back within `limit` steps. The
+    key defaults to the state itself.
+    """
+    key = key or (lambda state: state)
+    power = period = steps = 1
+    tortoise, hare = key(state), step_fn(state)
+    hare_key = key(hare)
+    while tortoise != hare_key:
+        if limit is not None and steps >= limit:
+            return None, None
+        if power == period:
+            tortoise = hare_key
+            power *= 2
+            period = 0
+        hare = step_fn(hare)
+        hare_key = key(hare)
+        period += 1
+        steps += 1
+
+    tortoise = hare = state
+    for _ in range(period):
+        hare = step_fn(hare)
+    start = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step_fn(tortoise), step_fn(hare)
+        start += 1
+    return start, period
+
+
+def advance(step_fn, state, steps):
+    for _ in range(steps):
+        state = step_fn(state)
+    return state
+
+
+def extrapolate(step_fn, state, n, metric, key=None):
+    """
+    metric() of the state after `n` steps, skipping whole periods once key(state) loops.
+
+    The metric may gain the same amount every period, as it does when a
+    pattern repeats while drifting along, or nothing at all.
+    """
+    start, period = find_cycle(step_fn, state, key, limit=n)
+    if period is None:
+        return metric(advance(step_fn, state, n))
+    cycles, rest = divmod(n - start, period)
+    state = advance(step_fn, state, start + rest)
+    later = advance(step_fn, state, period)
+    return metric(state) + cycles * (metric(later) - metric(state))
+
+
+def find_period(step_fn, state, n=None, metric=None, key=None):
+    """
+    Step `state` with `step_fn` until key(state) loops, or for `n` steps at most.
+
+    Returns (metrics, start, period): metric() of every state reached, the
+    step at which a state first came back, and how many steps before that
+    it was first seen; start and period are None if nothing came back in
+    time. Only 64-bit fingerprints of the keys are kept, never the states.
+    A repeated fingerprint only proposes a period: its key is kept, and the
+    period is accepted once the key one period later equals it, so a hash
+    collision cannot give a wrong period. The key defaults to the state.
+    """
+    key = key or (lambda state: state)
+    last_seen = {}
+    metrics = []
+    candidate = None  # (start, period, key at start) waiting to be confirmed
+    for index in count() if n is None else range(n + 1):
+        if index:
+            state = step_fn(state)
+        if metric:
+            metrics.append(metric(state))
+        state_key = key(state)
+        if candidate and index == candidate[0] + candidate[1]:
+            start, period, start_key = candidate
+            if state_key == start_key:
+                return metrics, start, period
+            candidate = None
+        fingerprint = hash(state_key)
+        if candidate is None and fingerprint in last_seen:
+            candidate = index, index - last_seen[fingerprint], state_key
+        last_seen[fingerprint] = index
+    return metrics, None, None
+
+
+def extrapolate_in_place(step_fn, state, n, metric, key=None):
+    """extrapolate() on find_period, for a `step_fn` that changes its state in place."""
+    metrics, start, period = find_period(step_fn, state, n, metric, key)
+    if period is None:
+        return metrics[n]
+    cycles, rest = divmod(n - start, period)
+    return metrics[start + rest] + cycles * (metrics[start + period] - metrics[start])
@@ -0,0 +1,127 @@
+"""
+Least-cost search over grid states packed into ints.
+
+A grid is a flat list padded with a one-cell border, so the four
+neighbours of a cell are plain index offsets with no bounds checks. A
+search state is any int below a known count, usually a cell index with a
+heading (and anything else the puzzle tracks) folded in, so the best cost
+of every state lives in one preallocated list.
+
+Solutions import this module by putting the repository root on sys.path.
+"""
+from heapq import heapify, heappop, heappush
+
+# Headings in circular order: East, South, West, North; turning left or
+# right is -1 or +1 modulo HEADINGS
+HEADINGS = 4
+UNREACHED = -1
+
+
+def pad_grid(rows, border=0):
+    """(flat list of `rows` inside a one-cell border of `border`, padded width)."""
+    width = len(rows[0]) + 2
+    cells = [border] * (width * (len(rows) + 2))
+    for y, row in enumerate(rows, start=1):
+        cells[y * width + 1:y * width + 1 + len(row)] = row
+    return cells, width
+
+
+def grid_steps(width):
+    """Flat index offsets of one step East, South, West and North."""
+    return 1, width, -1, -width
+
+
+def dijkstra(starts, neighbours, state_count, is_goal=None, max_step=None, track_paths=False):
+    """
+    Least costs from `starts`, (state, cost) pairs, to every state reached.
+
+    neighbours(state) gives (next state, step cost) pairs. With `max_step`
+    every step costs 1 to max_step, and a Dial bucket queue, a ring of
+    max_step + 1 lists indexed by cost modulo its size, replaces the binary
+    heap. The search stops at the first state popped that is_goal() accepts.
+
+    Returns (costs, predecessors, goal): costs[state] is the least cost
+    found (UNREACHED if none), predecessors[state] every state it is
+    reached from at that cost, i.e. the DAG of all best paths (None unless
+    `track_paths`), and goal the state the search stopped at, or None.
+    """
+    costs = [UNREACHED] * state_count
+    predecessors = [[] for _ in range(state_count)] if track_paths else None
+    queued = []
+    for state, cost in starts:
+        if costs[state] == UNREACHED:
+            queued.append(state)
+            costs[state] = cost
+        elif cost < costs[state]:
+            costs[state] = cost
+    if not queued:
+        return costs, predecessors, None
+    search = _heap_search if max_step is None else _dial_search
+    goal = search(queued, neighbours, costs, predecessors, is_goal, max_step)
+    return costs, predecessors, goal
+
+
+def _heap_search(queued, neighbours, costs, predecessors, is_goal, max_step):
+    heap = [(costs[state], state) for state in queued]
+    heapify(heap)
+    while heap:
+        cost, state = heappop(heap)
+        if cost != costs[state]:
+            continue  # Stale entry, already reached more cheaply
+        if is_goal and is_goal(state):
+            return state
+        for next_state, step in neighbours(state):
+            next_cost = cost + step
+            known = costs[next_state]
+            if known == UNREACHED or next_cost < known:
+                costs[next_state] = next_cost
+                if predecessors is not None:
+                    predecessors[next_state] = [state]
+                heappush(heap, (next_cost, next_state))
+            elif predecessors is not None and next_cost == known:
+                predecessors[next_state].append(state)
+    return None
+
+
+def _dial_search(queued, neighbours, costs, predecessors, is_goal, max_step):
+    ring = max_step + 1
+    buckets = [[] for _ in range(ring)]
+    for state in queued:
+        buckets[costs[state] % ring].append(state)
+    pending = len(queued)
+    # Start costs must lie within max_step of the cheapest one
+    cost = min(costs[state] for state in queued)
+    while pending:
+        bucket = buckets[cost % ring]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if costs[state] != cost:
+                continue  # Stale entry, already reached more cheaply
+            if is_goal and is_goal(state):
+                return state
+            for next_state, step in neighbours(state):
+                next_cost = cost + step
+                known = costs[next_state]
+                if known == UNREACHED or next_cost < known:
+                    costs[next_state] = next_cost
+                    if predecessors is not None:
+                        predecessors[next_state] = [state]
+                    buckets[next_cost % ring].append(next_state)
+                    pending += 1
+                elif predecessors is not None and next_cost == known:
+                    predecessors[next_state].append(state)
+        cost += 1
+    return None
+
+
+def trace_back(predecessors, target_states):
+    """Every state on some best path into `target_states`, walking the predecessor DAG."""
+    seen = set(target_states)
+    states_to_process = list(target_states)
+    while states_to_process:
+        for previous_state in predecessors[states_to_process.pop()]:
+            if previous_state not in seen:
+                seen.add(previous_state)
+                states_to_process.append(previous_state)
+    return seen
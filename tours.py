@@ -0,0 +1,39 @@
+"""
+Routes through every node of a small weighted graph.
+
+Solutions import this module by putting the repository root on sys.path.
+"""
+import numpy as np
+
+
+def held_karp(weights, cycle=False, maximize=False):
+    """
+    Best route from node 0 through every other node, by Held-Karp dynamic programming.
+
+    best[mask, j] is the best path from node 0 through exactly the nodes in
+    the bitmask `mask`, ending at node j. Masks are filled in order of size,
+    all masks of a size at once with NumPy for each end node, so the work is
+    O(2^n * n^2) instead of O(n!). With `cycle` the route also has to come
+    back to node 0, and with `maximize` the longest route is the best one.
+    """
+    weights = np.asarray(weights, dtype=np.int64)
+    n = len(weights)
+    worst = np.iinfo(np.int64).min // 4 if maximize else np.iinfo(np.int64).max // 4
+    pick = np.max if maximize else np.min
+
+    best = np.full((1 << n, n), worst, dtype=np.int64)
+    best[1, 0] = 0
+
+    masks = np.arange(1 << n)
+    sizes = np.array([bin(mask).count("1") for mask in range(1 << n)])
+    for size in range(2, n + 1):
+        layer = masks[(sizes == size) & (masks & 1 == 1)]
+        for node in range(1, n):
+            ending = layer[(layer >> node) & 1 == 1]
+            # Extend every path over the other nodes of the mask by a leg to `node`
+            best[ending, node] = pick(best[ending ^ (1 << node)] + weights[:, node], axis=1)
+
+    full = best[-1]
+    if cycle:
+        full = full + weights[:, 0]
+    return int(pick(full))